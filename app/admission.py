@@ -0,0 +1,172 @@
+import asyncio
+import math
+import os
+import time
+from typing import Any, Dict, List, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+def _class_setting(name: str, setting: str, default: str) -> str:
+    # e.g. ADMISSION_BACKGROUND_CONCURRENCY=2
+    return os.getenv(f"ADMISSION_{name.upper()}_{setting}", default)
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+class PriorityClass:
+    """
+    A bounded pool of request slots with a bounded FIFO wait queue. Requests that find the queue
+    full, or that wait longer than `queue_timeout`, are rejected instead of piling up.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.avg_service_time = 0.0 # Moving average of request duration, used for Retry-After
+
+    def _retry_after(self) -> float:
+        # Rough time for the current backlog to drain
+        return max(1.0, self.avg_service_time * (self.queued + 1) / self.max_concurrency)
+
+    async def acquire(self) -> float:
+        """
+        Waits for a slot and returns the time spent queued. Raises AdmissionRejected when shed.
+        """
+        started = time.monotonic()
+        if not self._slots.locked():
+            await self._slots.acquire() # A slot is free, returns without suspending
+        elif self.queued >= self.max_queue:
+            self.shed += 1
+            raise AdmissionRejected("queue full", self._retry_after())
+        else:
+            self.queued += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise AdmissionRejected("queue deadline exceeded", self._retry_after())
+            finally:
+                self.queued -= 1
+
+        wait = time.monotonic() - started
+        self.active += 1
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def release(self, service_time: float) -> None:
+        self.active -= 1
+        self.avg_service_time = service_time if self.avg_service_time == 0 else 0.9 * self.avg_service_time + 0.1 * service_time
+        self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "maxConcurrency": self.max_concurrency,
+            "maxQueue": self.max_queue,
+            "queueTimeoutSeconds": self.queue_timeout,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "timedOut": self.timed_out,
+            "avgWaitMs": round(self.total_wait / self.admitted * 1000, 1) if self.admitted else 0.0,
+            "maxWaitMs": round(self.max_wait * 1000, 1),
+            "avgServiceMs": round(self.avg_service_time * 1000, 1),
+        }
+
+class AdmissionController:
+    """
+    Maps request paths onto priority classes by prefix; the first matching rule wins and
+    unmatched paths fall into `default_class`.
+    """
+
+    def __init__(self, classes: List[PriorityClass], rules: List[Tuple[str, str]], default_class: str):
+        self.classes = {priority.name: priority for priority in classes}
+        self.rules = rules
+        self.default_class = default_class
+
+    def classify(self, path: str) -> PriorityClass:
+        for prefix, name in self.rules:
+            if path.startswith(prefix):
+                return self.classes[name]
+        return self.classes[self.default_class]
+
+    def stats(self) -> Dict[str, Any]:
+        return {name: priority.stats() for name, priority in self.classes.items()}
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware holding a slot of the request's priority class for the whole response,
+    including streamed bodies. Shed requests get 503 with Retry-After.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # CORS preflights are answered without doing any work
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.controller.classify(scope["path"])
+        try:
+            await priority.acquire()
+        except AdmissionRejected as e:
+            response = JSONResponse(
+                {"detail": f"Server busy ({priority.name} {e.reason}), please retry later"},
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(e.retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            priority.release(time.monotonic() - started)
+
+def _priority_class(name: str, concurrency: int, queue: int, timeout: float) -> PriorityClass:
+    return PriorityClass(
+        name,
+        max_concurrency=int(_class_setting(name, "CONCURRENCY", str(concurrency))),
+        max_queue=int(_class_setting(name, "QUEUE", str(queue))),
+        queue_timeout=float(_class_setting(name, "QUEUE_TIMEOUT", str(timeout))),
+    )
+
+# Interactive editing gets its own slots, so spikes of scrapes or exports can only fill theirs
+ADMISSION_RULES = [
+    ("/api/ai/", "interactive"),
+    ("/api/extract-field-value", "interactive"),
+    ("/api/scrape/linkedin/jobs", "standard"), # Queuing and polling jobs is cheap
+    ("/api/scrape/apify-stats", "standard"),
+    ("/api/scrape/", "background"),
+    ("/api/posts/get-all-posts", "background"),
+]
+
+# Singleton instance
+admission_controller = AdmissionController(
+    classes=[
+        _priority_class("interactive", concurrency=32, queue=64, timeout=10),
+        _priority_class("standard", concurrency=64, queue=128, timeout=5),
+        _priority_class("background", concurrency=4, queue=16, timeout=30),
+    ],
+    rules=ADMISSION_RULES,
+    default_class="standard",
+)
@@ -2,15 +2,34 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.responses import StreamingResponse
 from app.models import AnalyzePostRequest, AnalysisResult, AuthUser, AskQuestionRequest, AskQuestionResponse, GenerateEditRequest, GenerateEditResponse, TextToSpeechRequest
 from app.services.openai import openai_service
-from app.dependencies import get_current_user
-import io
+from app.rate_limit import ai_rate_limiter
+from app.dependencies import get_current_user, get_rate_limited_user
+from app.utils import format_sse
+from pydantic import BaseModel
+from typing import Any, AsyncIterator, Tuple
 
 router = APIRouter()
 
+# Disable proxy buffering so tokens reach the browser as they are generated
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+async def _sse_events(events: AsyncIterator[Tuple[str, Any]], label: str) -> AsyncIterator[str]:
+    try:
+        async for event, payload in events:
+            data = payload.model_dump() if isinstance(payload, BaseModel) else payload
+            yield format_sse(event, data)
+    except HTTPException as e:
+        yield format_sse("error", {"detail": e.detail, "status": e.status_code})
+    except ValueError as e:
+        yield format_sse("error", {"detail": str(e)})
+    except Exception as e:
+        print(f"{label} stream error: {e}")
+        yield format_sse("error", {"detail": f"Failed to {label.lower()}"})
+
 @router.post("/analyze-post", response_model=AnalysisResult)
 async def analyze_post(
     body: AnalyzePostRequest,
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
 ):
     # Validate postContent length
     if not body.postContent or len(body.postContent) == 0:
@@ -21,17 +40,15 @@ async def analyze_post(
     try:
         result = await openai_service.analyze_post(body.postContent, body.existingProfile)
         return result
+    except HTTPException as e:
+        raise e
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
         print(f"Analyze post error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to analyze post")
 
-@router.post("/ask-question", response_model=AskQuestionResponse)
-async def ask_question(
-    body: AskQuestionRequest,
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
-):
+def _validate_ask_question(body: AskQuestionRequest) -> None:
     # Validate postContent
     if not body.postContent or len(body.postContent) == 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Post content is required and must be a string")
@@ -42,6 +59,13 @@ async def ask_question(
     if len(body.conversationHistory) > 50:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="conversationHistory exceeds maximum of 50 messages")
 
+@router.post("/ask-question", response_model=AskQuestionResponse)
+async def ask_question(
+    body: AskQuestionRequest,
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
+):
+    _validate_ask_question(body)
+
     try:
         result = await openai_service.ask_question(
             body.postContent,
@@ -50,17 +74,31 @@ async def ask_question(
             body.missingFields
         )
         return result
+    except HTTPException as e:
+        raise e
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
         print(f"Ask question error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to ask question")
 
-@router.post("/generate-edit", response_model=GenerateEditResponse)
-async def generate_edit(
-    body: GenerateEditRequest,
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+@router.post("/ask-question/stream")
+async def ask_question_stream(
+    body: AskQuestionRequest,
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
 ):
+    # SSE variant: "token" events while the reply is generated, then "done" with the AskQuestionResponse
+    _validate_ask_question(body)
+
+    events = openai_service.stream_ask_question(
+        body.postContent,
+        body.conversationHistory,
+        body.existingContext,
+        body.missingFields
+    )
+    return StreamingResponse(_sse_events(events, "Ask question"), media_type="text/event-stream", headers=SSE_HEADERS)
+
+def _validate_generate_edit(body: GenerateEditRequest) -> None:
     # Validate text
     if not body.text or len(body.text) == 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Text is required and must be a string")
@@ -75,6 +113,13 @@ async def generate_edit(
     if body.conversationHistory is not None and not isinstance(body.conversationHistory, list):
       raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="conversationHistory must be an array")
 
+@router.post("/generate-edit", response_model=GenerateEditResponse)
+async def generate_edit(
+    body: GenerateEditRequest,
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
+):
+    _validate_generate_edit(body)
+
     try:
         result = await openai_service.generate_edit(
             body.text,
@@ -84,25 +129,74 @@ async def generate_edit(
             body.similarity
         )
         return result
+    except HTTPException as e:
+        raise e
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
         print(f"Generate edit error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate edit")
 
+@router.post("/generate-edit/stream")
+async def generate_edit_stream(
+    body: GenerateEditRequest,
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
+):
+    # SSE variant: "token" events while the edit is generated, then "done" with the GenerateEditResponse
+    _validate_generate_edit(body)
+
+    events = openai_service.stream_generate_edit(
+        body.text,
+        body.prompt,
+        body.context,
+        body.conversationHistory,
+        body.similarity
+    )
+    return StreamingResponse(_sse_events(events, "Generate edit"), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/text-to-speech")
 async def text_to_speech(
     body: TextToSpeechRequest,
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
 ):
     # Text validation is handled by TextToSpeechRequest Pydantic model implicitly
     # Max text length handled by Pydantic model and in service.
 
+    chunks = openai_service.stream_speech(body.text, body.voice)
     try:
-        audio_content = await openai_service.generate_speech(body.text, body.voice)
-        return StreamingResponse(io.BytesIO(audio_content), media_type="audio/mpeg")
+        # Wait for the first audio chunk so provider errors still map to an HTTP status
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        first_chunk = b""
+    except HTTPException as e:
+        raise e
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         print(f"Text-to-speech error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to generate speech")
+
+    async def audio() -> AsyncIterator[bytes]:
+        yield first_chunk
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # Headers are already sent, so the status can't change. Re-raising aborts the connection
+            # before the final chunk, and the client sees a failed transfer, not a truncated MP3.
+            print(f"Text-to-speech streaming error: {e}")
+            raise
+
+    return StreamingResponse(audio(), media_type="audio/mpeg")
+
+@router.get("/cache-stats")
+async def cache_stats(
+    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+):
+    # Hit/miss counters of the AI caches and request coalescing
+    return {
+        "responseCache": openai_service.response_cache.stats(),
+        "audioCache": openai_service.audio_cache.stats() if openai_service.audio_cache else None,
+        "singleFlight": openai_service.in_flight.stats(),
+        "rateLimit": ai_rate_limiter.stats(),
+    }
@@ -0,0 +1,262 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, BinaryIO, Dict, Hashable, Optional
+
+class TTLCache:
+    """
+    Bounded in-memory LRU cache where every entry carries its own expiry.
+    Expired entries are dropped lazily on access; when the cache is full the
+    least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size: int, default_ttl: Optional[float] = None):
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict() # key -> (expires_at, value)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Stores a value. `expires_at` is an absolute unix timestamp; when omitted
+        the cache's default TTL is applied (or the entry never expires).
+        """
+        if expires_at is None and self.default_ttl is not None:
+            expires_at = time.time() + self.default_ttl
+
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "maxSize": self.max_size, "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    Disk-backed string cache in a single SQLite file. Entries expire after their TTL and the
+    least recently accessed rows are evicted once the table exceeds `max_entries`.
+    Methods are blocking; async callers should go through ResponseCache.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE key IN ("
+                " SELECT key FROM cache_entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+class ResponseCache:
+    """
+    Two-tier cache for expensive upstream responses: an in-memory LRU in front of an optional
+    SQLite tier that survives restarts and is shared by workers on the same host.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, disk_path: Optional[str] = None, disk_max_entries: int = 100000):
+        self.ttl = ttl
+        self.memory = TTLCache(max_size=max_entries, default_ttl=ttl)
+        self.disk = SQLiteCache(disk_path, disk_max_entries) if disk_path else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            value = await asyncio.to_thread(self.disk.get, key)
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value, self.ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memoryEntries": len(self.memory),
+            "diskEnabled": self.disk is not None,
+        }
+
+class DiskLRUCache:
+    """
+    Size-capped cache of binary blobs stored as files in one directory. A file's mtime is its
+    last use; once the directory exceeds `max_bytes` the least recently used files are removed.
+    Entries are written through a temp file and renamed into place, so readers never see a
+    partial file and an interrupted write leaves nothing behind.
+
+    The directory's size is scanned once and then kept as a running total, so a write only
+    rescans when the total goes over `max_bytes`. Files written by other processes are picked
+    up at that rescan. Methods other than writer() block and belong in a worker thread.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, suffix: str = ""):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._total_bytes: Optional[int] = None # Unknown until the first scan
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def reader(self, key: str) -> Optional[BinaryIO]:
+        """
+        Opens the entry for reading and marks it as recently used, or returns None on a miss.
+        An entry evicted after opening stays readable through the returned file.
+        """
+        path = self._path(key)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path, None) # Mark as recently used
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return f
+
+    @asynccontextmanager
+    async def writer(self, key: str) -> AsyncIterator[BinaryIO]:
+        fd, tmp_path = await asyncio.to_thread(tempfile.mkstemp, dir=self.directory, suffix=".part")
+        f = os.fdopen(fd, "wb")
+        try:
+            yield f
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+        await asyncio.to_thread(self._commit, f, tmp_path, key)
+
+    def _commit(self, f: BinaryIO, tmp_path: str, key: str) -> None:
+        f.close()
+        path = self._path(key)
+        size = os.path.getsize(tmp_path)
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._total_bytes is not None:
+                self._total_bytes += size - replaced
+            over_limit = self._total_bytes is None or self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and not entry.name.endswith(".part"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total_bytes = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total_bytes <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass # Removed by another process meanwhile
+                total_bytes -= size
+            self._total_bytes = total_bytes
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "bytes": self._total_bytes or 0, "maxBytes": self.max_bytes}
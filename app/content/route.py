@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
-from typing import List
-from app.models import ContentPost, AuthUser
+from typing import List, Optional
+from app.models import ContentPage, ContentPost, AuthUser
 from app.services.content import content_service
 from app.dependencies import get_current_user
 
@@ -9,8 +9,8 @@ router = APIRouter()
 @router.get("/fetch", response_model=List[ContentPost])
 async def fetch_content(
     current_user: AuthUser = Depends(get_current_user), # Authentication is required
-    limit: int = Query(1000, description="Limit the number of content posts to fetch"),
-    offset: int = Query(0, description="Offset for pagination")
+    limit: int = Query(50, ge=1, le=1000, description="Limit the number of content posts to fetch"),
+    offset: int = Query(0, ge=0, description="Offset for pagination")
 ):
     try:
         content_posts = await content_service.fetch_creator_content(limit=limit, offset=offset)
@@ -18,3 +18,18 @@ async def fetch_content(
     except Exception as e:
         print(f"Fetch content error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch content")
+
+@router.get("/feed", response_model=ContentPage)
+async def fetch_content_page(
+    current_user: AuthUser = Depends(get_current_user), # Authentication is required
+    limit: int = Query(20, ge=1, le=100, description="Number of content posts per page"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page, omit for the first page"),
+    collapseDuplicates: bool = Query(False, description="Serve only the first post of each near-duplicate cluster")
+):
+    try:
+        return await content_service.fetch_creator_content_page(limit=limit, cursor=cursor, collapse_duplicates=collapseDuplicates)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        print(f"Fetch content page error: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch content")
@@ -1,15 +1,70 @@
+import asyncio
+import hashlib
+import os
 from fastapi import HTTPException, status, Request, Depends
-from typing import Optional
+from typing import Optional, Tuple
+import jwt
+from app.cache import TTLCache
 from app.models import AuthUser
-from app.supabase_client import get_supabase_client
-from supabase import Client
+from app.rate_limit import RateLimitExceeded, ai_rate_limiter, estimate_request_cost
+from app.supabase_client import supabase_service_client
 
 # This will need to be replaced with the actual project ref from Supabase
 # or dynamically retrieved if necessary. For now, using a placeholder.
 SUPABASE_PROJECT_REF = "your-supabase-project-ref"
 
+# Local JWT verification settings.
+# Projects signing sessions with the legacy shared secret (HS256) need SUPABASE_JWT_SECRET;
+# projects using asymmetric signing keys are verified against the project's JWKS endpoint.
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWT_AUDIENCE = os.getenv("SUPABASE_JWT_AUDIENCE", "authenticated")
+SUPABASE_JWKS_URL = os.getenv("SUPABASE_JWKS_URL") or f"{os.getenv('NEXT_PUBLIC_SUPABASE_URL', '').rstrip('/')}/auth/v1/.well-known/jwks.json"
+JWKS_CACHE_SECONDS = int(os.getenv("SUPABASE_JWKS_CACHE_SECONDS", "600"))
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+
+# Validated tokens are cached until their `exp` claim, so repeat requests skip verification entirely
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+
+_token_cache = TTLCache(max_size=AUTH_TOKEN_CACHE_SIZE)
+_jwks_client = jwt.PyJWKClient(SUPABASE_JWKS_URL, cache_keys=True, lifespan=JWKS_CACHE_SECONDS)
+
+async def _verify_access_token(access_token: str) -> Tuple[Optional[AuthUser], int]:
+    """
+    Verifies a Supabase session JWT and returns the user together with the token's `exp`.
+    Verification happens locally whenever a key is available; only HS256 tokens without a
+    configured secret fall back to a round trip to Supabase Auth.
+    """
+    algorithm = jwt.get_unverified_header(access_token).get("alg")
+
+    if algorithm == "HS256" and not SUPABASE_JWT_SECRET:
+        # No local key for legacy tokens, let Supabase Auth validate it
+        # Note: supabase-py's client.auth.get_user is synchronous, keep it off the event loop
+        user_response = await asyncio.to_thread(supabase_service_client.auth.get_user, access_token)
+        user = user_response.user if user_response else None
+        claims = jwt.decode(access_token, options={"verify_signature": False})
+        if not user:
+            return None, claims.get("exp", 0)
+        return AuthUser(id=user.id, email=user.email), claims.get("exp", 0)
+
+    if algorithm == "HS256":
+        key = SUPABASE_JWT_SECRET
+    elif algorithm in ASYMMETRIC_ALGORITHMS:
+        # PyJWKClient fetches over blocking urllib; keys are cached after the first lookup
+        signing_key = await asyncio.to_thread(_jwks_client.get_signing_key_from_jwt, access_token)
+        key = signing_key.key
+    else:
+        raise jwt.InvalidAlgorithmError(f"Unsupported token algorithm: {algorithm}")
+
+    claims = jwt.decode(
+        access_token,
+        key,
+        algorithms=[algorithm],
+        audience=SUPABASE_JWT_AUDIENCE,
+        options={"require": ["exp", "sub"]},
+    )
+    return AuthUser(id=claims["sub"], email=claims.get("email")), claims["exp"]
+
 async def get_current_user(request: Request) -> AuthUser:
-    supabase_client: Client = get_supabase_client()
     access_token: Optional[str] = None
 
     # Supabase session token is typically stored in a cookie.
@@ -27,11 +82,13 @@ async def get_current_user(request: Request) -> AuthUser:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    cache_key = hashlib.sha256(access_token.encode()).hexdigest()
+    cached_user = _token_cache.get(cache_key)
+    if cached_user:
+        return cached_user
+
     try:
-        # Verify the access token using Supabase
-        # Note: supabase-py's client.auth.get_user returns a UserResponse object
-        user_response = await supabase_client.auth.get_user(access_token)
-        user = user_response.user
+        user, expires_at = await _verify_access_token(access_token)
 
         if not user:
             raise HTTPException(
@@ -39,12 +96,18 @@ async def get_current_user(request: Request) -> AuthUser:
                 detail="Not authenticated: Invalid access token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        
-        # You might need to adjust the field names based on the actual Supabase User object structure
-        return AuthUser(id=user.id, email=user.email)
+
+        _token_cache.set(cache_key, user, expires_at=expires_at)
+        return user
 
     except HTTPException as e:
         raise e
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated: Access token has expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     except Exception as e:
         print(f"Authentication error: {e}")
         raise HTTPException(
@@ -53,6 +116,16 @@ async def get_current_user(request: Request) -> AuthUser:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+async def get_rate_limited_user(request: Request, current_user: AuthUser = Depends(get_current_user)) -> AuthUser:
+    """
+    Authenticates the user and charges the request against the AI rate limits, sized by its body.
+    """
+    body = await request.body() # Already read and cached by the body parser
+    retry_after = await ai_rate_limiter.acquire(current_user.id, estimate_request_cost(len(body)))
+    if retry_after > 0:
+        raise RateLimitExceeded(retry_after)
+    return current_user
+
 # Example of how to use this dependency in a route:
 # @router.get("/protected-route")
 # async def protected_route(current_user: AuthUser = Depends(get_current_user)):
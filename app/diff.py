@@ -0,0 +1,241 @@
+import re
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+from app.models import DiffSpan
+
+# Most edits a single Myers search may explore before a region is reported as one replacement.
+# Bounds worst-case time on unrelated texts; smaller gaps get a shortest edit script.
+DIFF_MAX_EDIT_COST = 2000
+
+_TOKEN_PATTERN = re.compile(r"\S+")
+
+# (tag, a_start, a_end, b_start, b_end) over token indices, tag is "equal", "delete" or "insert"
+Opcode = Tuple[str, int, int, int, int]
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Splits text into whitespace-separated words as (word, start, end) character offsets.
+    """
+    return [(m.group(), m.start(), m.end()) for m in _TOKEN_PATTERN.finditer(text)]
+
+def word_diff(original: str, suggested: str) -> Tuple[int, int, List[DiffSpan]]:
+    """
+    Word-level diff of two texts. Returns (added words, deleted words, changed spans), where each
+    span carries character offsets into both texts and adjacent deletes/inserts are merged into
+    one replacement.
+
+    Common prefix/suffix are trimmed, words that occur exactly once on both sides anchor the
+    alignment (patience diff), and the gaps between anchors are diffed with Myers' linear-space
+    bisection.
+    """
+    original_tokens = tokenize(original)
+    suggested_tokens = tokenize(suggested)
+
+    # Compare small ints instead of strings in the inner loops
+    ids = {}
+    a = [ids.setdefault(token, len(ids)) for token, _, _ in original_tokens]
+    b = [ids.setdefault(token, len(ids)) for token, _, _ in suggested_tokens]
+
+    opcodes: List[Opcode] = []
+    _diff_range(a, 0, len(a), b, 0, len(b), opcodes)
+
+    additions = 0
+    deletions = 0
+    changes: List[DiffSpan] = []
+    pending: Optional[List[int]] = None # [a_start, a_end, b_start, b_end] of the current change
+    for tag, a0, a1, b0, b1 in opcodes + [("equal", len(a), len(a), len(b), len(b))]:
+        if tag != "equal":
+            if pending is None:
+                pending = [a0, a1, b0, b1]
+            else:
+                pending[1], pending[3] = a1, b1
+            continue
+        if pending is not None:
+            deletions += pending[1] - pending[0]
+            additions += pending[3] - pending[2]
+            changes.append(_to_span(pending, original_tokens, suggested_tokens, len(original), len(suggested)))
+            pending = None
+
+    return additions, deletions, changes
+
+def _to_span(
+    change: List[int],
+    original_tokens: List[Tuple[str, int, int]],
+    suggested_tokens: List[Tuple[str, int, int]],
+    original_length: int,
+    suggested_length: int,
+) -> DiffSpan:
+    a0, a1, b0, b1 = change
+    if a0 == a1:
+        op = "insert"
+    elif b0 == b1:
+        op = "delete"
+    else:
+        op = "replace"
+
+    original_start, original_end = _char_range(original_tokens, a0, a1, original_length)
+    suggested_start, suggested_end = _char_range(suggested_tokens, b0, b1, suggested_length)
+    return DiffSpan(
+        op=op,
+        originalStart=original_start,
+        originalEnd=original_end,
+        suggestedStart=suggested_start,
+        suggestedEnd=suggested_end,
+    )
+
+def _char_range(tokens: List[Tuple[str, int, int]], start: int, end: int, text_length: int) -> Tuple[int, int]:
+    if start < end:
+        return tokens[start][1], tokens[end - 1][2]
+    # Empty side of an insert/delete: the position just before the next word
+    position = tokens[start][1] if start < len(tokens) else text_length
+    return position, position
+
+def _diff_range(a: List[int], a_lo: int, a_hi: int, b: List[int], b_lo: int, b_hi: int, opcodes: List[Opcode]) -> None:
+    # Common prefix
+    start_a, start_b = a_lo, b_lo
+    while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+        a_lo += 1
+        b_lo += 1
+    if a_lo > start_a:
+        opcodes.append(("equal", start_a, a_lo, start_b, b_lo))
+
+    # Common suffix, emitted after the middle
+    end_a, end_b = a_hi, b_hi
+    while a_hi > a_lo and b_hi > b_lo and a[a_hi - 1] == b[b_hi - 1]:
+        a_hi -= 1
+        b_hi -= 1
+
+    if a_lo == a_hi or b_lo == b_hi:
+        if a_lo < a_hi:
+            opcodes.append(("delete", a_lo, a_hi, b_lo, b_lo))
+        if b_lo < b_hi:
+            opcodes.append(("insert", a_hi, a_hi, b_lo, b_hi))
+    else:
+        anchors = _unique_anchors(a, a_lo, a_hi, b, b_lo, b_hi)
+        if anchors:
+            prev_a, prev_b = a_lo, b_lo
+            for i, j in anchors:
+                _diff_range(a, prev_a, i, b, prev_b, j, opcodes)
+                opcodes.append(("equal", i, i + 1, j, j + 1))
+                prev_a, prev_b = i + 1, j + 1
+            _diff_range(a, prev_a, a_hi, b, prev_b, b_hi, opcodes)
+        else:
+            split = _middle_snake(a, a_lo, a_hi, b, b_lo, b_hi)
+            if split is None or split in ((a_lo, b_lo), (a_hi, b_hi)):
+                # No overlap within the edit budget, report the region as one replacement
+                opcodes.append(("delete", a_lo, a_hi, b_lo, b_lo))
+                opcodes.append(("insert", a_hi, a_hi, b_lo, b_hi))
+            else:
+                x, y = split
+                _diff_range(a, a_lo, x, b, b_lo, y, opcodes)
+                _diff_range(a, x, a_hi, b, y, b_hi, opcodes)
+
+    if a_hi < end_a:
+        opcodes.append(("equal", a_hi, end_a, b_hi, end_b))
+
+def _unique_anchors(a: List[int], a_lo: int, a_hi: int, b: List[int], b_lo: int, b_hi: int) -> List[Tuple[int, int]]:
+    """
+    Longest increasing sequence of (i, j) pairs for tokens occurring exactly once in a[a_lo:a_hi]
+    and once in b[b_lo:b_hi].
+    """
+    a_index = {}
+    for i in range(a_lo, a_hi):
+        a_index[a[i]] = -1 if a[i] in a_index else i
+
+    b_index = {}
+    for j in range(b_lo, b_hi):
+        token = b[j]
+        if a_index.get(token, -1) >= 0:
+            b_index[token] = -1 if token in b_index else j
+
+    # Ordered by position in b; keep the longest run that is also increasing in a
+    pairs = [(a_index[token], j) for token, j in b_index.items() if j >= 0]
+    if not pairs:
+        return []
+
+    tails: List[int] = [] # a-index ending the best run of each length
+    tail_pairs: List[int] = [] # index into pairs of that run's last element
+    previous = [-1] * len(pairs)
+    for p, (i, _) in enumerate(pairs):
+        length = bisect_left(tails, i)
+        if length == len(tails):
+            tails.append(i)
+            tail_pairs.append(p)
+        else:
+            tails[length] = i
+            tail_pairs[length] = p
+        previous[p] = tail_pairs[length - 1] if length > 0 else -1
+
+    anchors = []
+    p = tail_pairs[-1]
+    while p != -1:
+        anchors.append(pairs[p])
+        p = previous[p]
+    anchors.reverse()
+    return anchors
+
+def _middle_snake(a: List[int], a_lo: int, a_hi: int, b: List[int], b_lo: int, b_hi: int) -> Optional[Tuple[int, int]]:
+    """
+    Myers' bisection: runs the forward and reverse greedy searches until they overlap and returns
+    the split point (absolute indices) on a shortest edit path, in O(N + M) space. Expects both
+    ranges non-empty. Returns None if no overlap is found within DIFF_MAX_EDIT_COST edits.
+    """
+    n = a_hi - a_lo
+    m = b_hi - b_lo
+    max_d = (n + m + 1) // 2
+    v_offset = max_d + 1
+    v_length = 2 * max_d + 2
+    v1 = [-1] * v_length
+    v1[v_offset + 1] = 0
+    v2 = v1[:]
+    delta = n - m
+    # With an odd delta the paths meet during a forward step, otherwise during a reverse step
+    front = delta % 2 != 0
+    k1_start = k1_end = k2_start = k2_end = 0
+
+    for d in range(min(max_d, DIFF_MAX_EDIT_COST // 2 + 1)):
+        for k1 in range(-d + k1_start, d + 1 - k1_end, 2):
+            k1_offset = v_offset + k1
+            if k1 == -d or (k1 != d and v1[k1_offset - 1] < v1[k1_offset + 1]):
+                x1 = v1[k1_offset + 1]
+            else:
+                x1 = v1[k1_offset - 1] + 1
+            y1 = x1 - k1
+            while x1 < n and y1 < m and a[a_lo + x1] == b[b_lo + y1]:
+                x1 += 1
+                y1 += 1
+            v1[k1_offset] = x1
+            if x1 > n:
+                k1_end += 2 # Ran off the right of the grid
+            elif y1 > m:
+                k1_start += 2 # Ran off the bottom of the grid
+            elif front:
+                k2_offset = v_offset + delta - k1
+                if 0 <= k2_offset < v_length and v2[k2_offset] != -1:
+                    if x1 >= n - v2[k2_offset]:
+                        return a_lo + x1, b_lo + y1
+
+        for k2 in range(-d + k2_start, d + 1 - k2_end, 2):
+            k2_offset = v_offset + k2
+            if k2 == -d or (k2 != d and v2[k2_offset - 1] < v2[k2_offset + 1]):
+                x2 = v2[k2_offset + 1]
+            else:
+                x2 = v2[k2_offset - 1] + 1
+            y2 = x2 - k2
+            while x2 < n and y2 < m and a[a_hi - 1 - x2] == b[b_hi - 1 - y2]:
+                x2 += 1
+                y2 += 1
+            v2[k2_offset] = x2
+            if x2 > n:
+                k2_end += 2
+            elif y2 > m:
+                k2_start += 2
+            elif not front:
+                k1_offset = v_offset + delta - k2
+                if 0 <= k1_offset < v_length and v1[k1_offset] != -1:
+                    x1 = v1[k1_offset]
+                    y1 = v_offset + x1 - k1_offset
+                    if x1 >= n - x2:
+                        return a_lo + x1, b_lo + y1
+
+    return None
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from app.models import ExtractFieldValueRequest, AuthUser
+from app.models import ExtractFieldValueRequest, ExtractFieldValuesRequest, AuthUser
 from app.services.openai import openai_service
-from app.dependencies import get_current_user
+from app.dependencies import get_rate_limited_user
 from typing import Dict, Any
 
 router = APIRouter()
@@ -9,7 +9,7 @@ router = APIRouter()
 @router.post("/", response_model=Dict[str, Any]) # Return type is { "value": extractedValue }
 async def extract_field_value(
     body: ExtractFieldValueRequest,
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
 ):
     # Validate transcript
     if not body.transcript or len(body.transcript) == 0:
@@ -24,8 +24,37 @@ async def extract_field_value(
     try:
         extracted_value = await openai_service.extract_field_value(body.transcript, body.fieldLabel)
         return {"value": extracted_value}
+    except HTTPException as e:
+        raise e
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
     except Exception as e:
         print(f"Extract field value error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to extract value")
+
+
+@router.post("/batch", response_model=Dict[str, Any]) # Return type is { "values": { fieldLabel: extractedValue } }
+async def extract_field_values(
+    body: ExtractFieldValuesRequest,
+    current_user: AuthUser = Depends(get_rate_limited_user) # Authentication and AI rate limits
+):
+    # Validate transcript
+    if not body.transcript or len(body.transcript) == 0:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Transcript is required and must be a string")
+    if len(body.transcript) > 5000:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Transcript exceeds maximum length of 5,000 characters")
+
+    # Validate fieldLabels (count is bounded by the request model)
+    if any(not label or not label.strip() for label in body.fieldLabels):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Field labels must be non-empty strings")
+
+    try:
+        values = await openai_service.extract_field_values(body.transcript, body.fieldLabels)
+        return {"values": values}
+    except HTTPException as e:
+        raise e
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+    except Exception as e:
+        print(f"Extract field values error: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to extract values")
@@ -0,0 +1,118 @@
+import asyncio
+import bisect
+import hashlib
+import heapq
+import os
+import time
+from array import array
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Set, Tuple
+
+# Rebuilt from the database this often, dropping URLs of deleted posts and picking up other processes' inserts
+KNOWN_POST_URLS_REBUILD_SECONDS = float(os.getenv("KNOWN_POST_URLS_REBUILD_SECONDS", "21600"))
+# Recent inserts are kept in a set and merged into the sorted array once there are this many
+KNOWN_POST_URLS_MAX_PENDING = int(os.getenv("KNOWN_POST_URLS_MAX_PENDING", "50000"))
+# Wait before retrying a failed load
+KNOWN_POST_URLS_RETRY_SECONDS = 60.0
+
+def _digest(post_url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(post_url.encode(), digest_size=8).digest(), "little")
+
+def _in_sorted(digests: array, digest: int) -> bool:
+    index = bisect.bisect_left(digests, digest)
+    return index < len(digests) and digests[index] == digest
+
+class KnownPostUrls:
+    """
+    Membership set of the post URLs already stored in creator_content, held as a sorted array
+    of 64-bit digests (8 bytes per post). A hit means the post is stored, short of a digest
+    collision (about n / 2**64 per lookup); a miss only means "ask the database", since other
+    processes insert too.
+
+    The set loads in the background on first use and serves misses until it is ready, so
+    ingest never waits for it.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], AsyncIterator[List[str]]],
+        rebuild_interval: float = KNOWN_POST_URLS_REBUILD_SECONDS,
+        max_pending: int = KNOWN_POST_URLS_MAX_PENDING
+    ):
+        self.loader = loader
+        self.rebuild_interval = rebuild_interval
+        self.max_pending = max_pending
+        self._digests = array("Q") # Sorted
+        self._pending: Set[int] = set()
+        self._built_at: Optional[float] = None
+        self._next_attempt = 0.0
+        self._build_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._digests) + len(self._pending)
+
+    @property
+    def ready(self) -> bool:
+        return self._built_at is not None
+
+    def _contains(self, digest: int) -> bool:
+        return digest in self._pending or _in_sorted(self._digests, digest)
+
+    def warm(self) -> None:
+        """
+        Starts a (re)build in the background when none is loaded yet or the current one is due.
+        """
+        now = time.monotonic()
+        if self._build_task is not None or now < self._next_attempt:
+            return
+        if self._built_at is not None and now - self._built_at < self.rebuild_interval:
+            return
+        self._build_task = asyncio.create_task(self._build())
+
+    async def _build(self) -> None:
+        started = time.monotonic()
+        try:
+            digests = array("Q")
+            async for post_urls in self.loader():
+                digests.extend(_digest(post_url) for post_url in post_urls)
+            digests = array("Q", sorted(digests))
+
+            # Inserts recorded while loading may be missing from the pages already read, keep them
+            pending = {digest for digest in self._pending if not _in_sorted(digests, digest)}
+            self._digests, self._pending = digests, pending
+            self._built_at = time.monotonic()
+            print(f"Loaded {len(digests)} known post URLs in {self._built_at - started:.1f}s")
+        except Exception as e:
+            print(f"Failed to load known post URLs: {e}")
+            self._next_attempt = time.monotonic() + KNOWN_POST_URLS_RETRY_SECONDS
+        finally:
+            self._build_task = None
+
+    def partition(self, post_urls: Iterable[str]) -> Tuple[Set[str], List[str]]:
+        """
+        Splits the URLs into (known to be stored, to be checked against the database).
+        """
+        self.warm()
+        if not self.ready:
+            post_urls = list(post_urls)
+            self.misses += len(post_urls)
+            return set(), post_urls
+
+        known: Set[str] = set()
+        unknown: List[str] = []
+        for post_url in post_urls:
+            if self._contains(_digest(post_url)):
+                known.add(post_url)
+            else:
+                unknown.append(post_url)
+        self.hits += len(known)
+        self.misses += len(unknown)
+        return known, unknown
+
+    def add(self, post_urls: Iterable[str]) -> None:
+        self._pending.update(_digest(post_url) for post_url in post_urls)
+        # Not while a rebuild runs: the rebuild only carries over what is still pending when it ends
+        if len(self._pending) >= self.max_pending and self._build_task is None:
+            self._digests = array("Q", heapq.merge(self._digests, sorted(self._pending)))
+            self._pending = set()
@@ -1,16 +1,26 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from app.admission import AdmissionControlMiddleware, admission_controller
+from app.dependencies import get_current_user
+from app.models import AuthUser
 from app.creators import router as creators_router
 from app.ai.route import router as ai_router
 from app.content.route import router as content_router
 from app.extraction.route import router as extraction_router
 from app.posts.route import router as posts_router
 from app.scrape.route import router as scrape_router
+from app.services.linkedin_scraper import linked_in_scraper_service
+from app.services.rescrape_scheduler import RESCRAPE_ENABLED, rescrape_scheduler
+from app.services.scrape_jobs import scrape_job_service
 from app.user_data.route import router as user_data_router
 from app.user_posts.route import router as user_posts_router
 
 app = FastAPI()
 
+# Added before CORS so CORS stays outermost and 503 responses still carry its headers
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
@@ -28,8 +38,30 @@ app.include_router(scrape_router, prefix="/api/scrape", tags=["scrape"])
 app.include_router(user_data_router, prefix="/api/user-data", tags=["user_data"])
 app.include_router(user_posts_router, prefix="/api/user-posts", tags=["user_posts"])
 
+@app.on_event("startup")
+async def start_background_workers():
+    scrape_job_service.start()
+    if linked_in_scraper_service.apify_token and linked_in_scraper_service.known_post_urls is not None:
+        linked_in_scraper_service.known_post_urls.warm() # Load ahead of the first scrape
+    if linked_in_scraper_service.apify_token and linked_in_scraper_service.near_duplicates is not None:
+        asyncio.ensure_future(linked_in_scraper_service.near_duplicates.load())
+    if RESCRAPE_ENABLED and linked_in_scraper_service.apify_token:
+        rescrape_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await scrape_job_service.stop()
+    await rescrape_scheduler.stop()
+
 @app.get("/")
 async def read_root():
     return {"message": "Hello, FastAPI in pyrewrite!"}
 
+@app.get("/api/admission-stats")
+async def admission_stats(
+    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+):
+    # Queue depth, wait times and shed counts per priority class
+    return admission_controller.stats()
+
 # TODO: Implement other API endpoints from the existing project.
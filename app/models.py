@@ -2,6 +2,15 @@ from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Literal
 
+class CreatorStats(BaseModel):
+    postCount: int = 0
+    totalReactions: int = 0
+    totalComments: int = 0
+    totalReposts: int = 0
+    avgReactions: float = 0.0
+    avgComments: float = 0.0
+    avgReposts: float = 0.0
+
 class CreatorProfile(BaseModel):
     id: Optional[str] = None  # Assuming 'id' or 'creator_id' is the primary key
     creator_id: Optional[int] = None
@@ -9,6 +18,12 @@ class CreatorProfile(BaseModel):
     display_name: Optional[str] = None
     platform: str
     created_at: Optional[datetime] = None
+    # Ingest bookkeeping, loaded from the table but never serialized into API responses
+    # High-water mark: the newest post already ingested for this creator
+    last_post_urn: Optional[str] = Field(default=None, exclude=True)
+    last_posted_at_timestamp: Optional[int] = Field(default=None, exclude=True)
+    last_scraped_at: Optional[datetime] = Field(default=None, exclude=True) # Set by the re-scrape scheduler
+    stats: Optional[CreatorStats] = None # Engagement aggregates, populated by the creators endpoints
 
     class Config:
         from_attributes = True
@@ -22,6 +37,32 @@ class CreatorProfileForContent(BaseModel):
     class Config:
         from_attributes = True
 
+# ContentPost related models
+class PostStats(BaseModel):
+    total_reactions: Optional[int] = None
+    comments: Optional[int] = None
+    reposts: Optional[int] = None
+
+class PostMedia(BaseModel):
+    type: Optional[str] = None
+    url: Optional[str] = None
+
+class Article(BaseModel):
+    title: Optional[str] = None
+    url: Optional[str] = None
+
+class PostProjection(BaseModel):
+    # Parsed view of post_raw, materialized on creator_content at ingest so the feed never re-parses JSON
+    post_text: str = ""
+    post_title: str = "Untitled Post"
+    posted_at_date: Optional[str] = None
+    posted_at_timestamp: Optional[int] = None # Unix timestamp (ms)
+    posted_at_relative: Optional[str] = None # e.g. "3d", display label captured at scrape time
+    post_type: Optional[str] = None
+    post_stats: Optional[PostStats] = None
+    post_media: Optional[List[PostMedia]] = None
+    post_article: Optional[Article] = None
+
 class CreatorContent(BaseModel):
     content_id: int
     creator_id: int
@@ -41,6 +82,18 @@ class CreatorContentWithProfile(BaseModel):
     created_at: datetime
     updated_at: datetime
     creator_profiles: CreatorProfileForContent # Nested Pydantic model
+    # Materialized projection columns, None until the row is ingested or backfilled
+    post_text: Optional[str] = None
+    post_title: Optional[str] = None
+    posted_at_date: Optional[str] = None
+    posted_at_timestamp: Optional[int] = None
+    posted_at_relative: Optional[str] = None
+    post_type: Optional[str] = None
+    post_stats: Optional[PostStats] = None
+    post_media: Optional[List[PostMedia]] = None
+    post_article: Optional[Article] = None
+    near_duplicate_cluster: Optional[int] = None
+    is_near_duplicate: bool = False
 
     class Config:
         from_attributes = True
@@ -85,6 +138,14 @@ class ConversationMessage(BaseModel):
     role: Literal["assistant", "user"]
     content: str
 
+class PromptUsage(BaseModel):
+    promptTokens: int = 0 # Input tokens sent, counted locally
+    budget: int
+    overBudget: bool = False
+    summarizedMessages: int = 0 # Older conversation messages condensed into a summary
+    droppedContextFields: List[str] = []
+    bodyTruncated: bool = False
+
 class AskQuestionRequest(BaseModel):
     postContent: str
     conversationHistory: List[ConversationMessage] = []
@@ -94,6 +155,7 @@ class AskQuestionRequest(BaseModel):
 class AskQuestionResponse(BaseModel):
     ready: bool
     question: Optional[str] = None
+    usage: Optional[PromptUsage] = None
 
 class GenerateEditRequest(BaseModel):
     text: str
@@ -102,30 +164,26 @@ class GenerateEditRequest(BaseModel):
     conversationHistory: Optional[List[ConversationMessage]] = None
     similarity: Optional[int] = None # 0-100
 
+class DiffSpan(BaseModel):
+    op: Literal["insert", "delete", "replace"]
+    # Character offsets, end exclusive; an insert has an empty original range and a delete an empty suggested one
+    originalStart: int
+    originalEnd: int
+    suggestedStart: int
+    suggestedEnd: int
+
 class GenerateEditResponse(BaseModel):
     originalText: str
     suggestedText: str
-    additions: int
-    deletions: int
+    additions: int # Words added
+    deletions: int # Words removed
+    changes: List[DiffSpan] = []
+    usage: Optional[PromptUsage] = None
 
 class TextToSpeechRequest(BaseModel):
     text: str
     voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "alloy"
 
-# ContentPost related models
-class PostStats(BaseModel):
-    total_reactions: Optional[int] = None
-    comments: Optional[int] = None
-    reposts: Optional[int] = None
-
-class PostMedia(BaseModel):
-    type: Optional[str] = None
-    url: Optional[str] = None
-
-class Article(BaseModel):
-    title: Optional[str] = None
-    url: Optional[str] = None
-
 class ContentPost(BaseModel):
     id: int
     title: str
@@ -142,11 +200,21 @@ class ContentPost(BaseModel):
     stats: Optional[PostStats] = None
     media: Optional[List[PostMedia]] = None
     article: Optional[Article] = None
+    duplicateCluster: Optional[str] = None # Posts sharing a value are near-duplicates (string: 64-bit id)
+    isNearDuplicate: bool = False
+
+class ContentPage(BaseModel):
+    posts: List[ContentPost]
+    nextCursor: Optional[str] = None # Opaque cursor for the next page, None on the last page
 
 class ExtractFieldValueRequest(BaseModel):
     transcript: str
     fieldLabel: str
 
+class ExtractFieldValuesRequest(BaseModel):
+    transcript: str
+    fieldLabels: List[str] = Field(..., min_length=1, max_length=50)
+
 class LinkedInScrapeRequest(BaseModel):
     profileUrls: List[str] = Field(..., min_length=1, max_length=50)
 
@@ -193,10 +261,25 @@ class ApiMaestroPost(BaseModel):
 class ScrapeResult(BaseModel):
     success: bool
     postsScraped: int
+    newPosts: Optional[int] = None # Posts not seen before, saved by this scrape
+    statsRefreshed: Optional[int] = None # Already-ingested posts whose engagement stats changed
     posts: Optional[List[ApiMaestroPost]] = None
     error: Optional[str] = None
     urlsSent: Optional[List[str]] = None
 
+class ScrapeJob(BaseModel):
+    jobId: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    profileUrls: List[str]
+    profilesTotal: int
+    profilesCompleted: int = 0
+    postsScraped: int = 0 # Posts fetched so far, across completed profiles
+    result: Optional[ScrapeResult] = None
+    error: Optional[str] = None
+    attempts: int = 0 # Runs interrupted by their worker stopping
+    createdAt: datetime
+    updatedAt: datetime
+
 class UserDataPutRequest(BaseModel):
     userId: str
     data: Dict[str, Any] # 'data' can be any JSON structure
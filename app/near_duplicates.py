@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import os
+import re
+import threading
+from array import array
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+# Posts whose estimated word-shingle Jaccard similarity reaches this are near-duplicates
+NEAR_DUPLICATE_MIN_SIMILARITY = float(os.getenv("NEAR_DUPLICATE_MIN_SIMILARITY", "0.6"))
+# Texts shorter than this (in words) are not compared: a couple of words say nothing about copying
+NEAR_DUPLICATE_MIN_WORDS = int(os.getenv("NEAR_DUPLICATE_MIN_WORDS", "8"))
+# Most recent posts kept in the index (about 1 KB each); older ones are no longer matched against
+NEAR_DUPLICATE_INDEX_SIZE = int(os.getenv("NEAR_DUPLICATE_INDEX_SIZE", "100000"))
+
+SHINGLE_WORDS = 3
+# One-permutation MinHash: each shingle hash lands in one of SIGNATURE_SIZE buckets, which keep
+# their minimum. 8 LSH bands of 4 buckets make pairs around 0.6 similarity likely to collide.
+SIGNATURE_SIZE = 32
+BANDS = 8
+ROWS_PER_BAND = SIGNATURE_SIZE // BANDS
+EMPTY_BUCKET = 1 << 32
+DENSIFY_OFFSET = 0x9E3779B1 # Keeps borrowed values distinct from the bucket they came from
+WORD_RE = re.compile(r"\w+")
+
+Signature = array # array("I") of SIGNATURE_SIZE 32-bit minimums
+
+def minhash_signature(text: Optional[str]) -> Optional[Signature]:
+    """
+    MinHash signature of the text's word 3-shingles (case and punctuation ignored), or None when
+    the text is too short to compare. Shingles are hashed once with hash(), so signatures are
+    only comparable within one process.
+    """
+    words = WORD_RE.findall((text or "").lower())
+    if len(words) < NEAR_DUPLICATE_MIN_WORDS:
+        return None
+
+    buckets = [EMPTY_BUCKET] * SIGNATURE_SIZE
+    for i in range(len(words) - SHINGLE_WORDS + 1):
+        shingle_hash = hash(" ".join(words[i:i + SHINGLE_WORDS])) & 0xFFFFFFFFFFFFFFFF
+        bucket = shingle_hash % SIGNATURE_SIZE
+        value = (shingle_hash >> 8) & 0xFFFFFFFF
+        if value < buckets[bucket]:
+            buckets[bucket] = value
+
+    # Short texts leave buckets empty; each borrows from the next filled bucket (rotation densification)
+    signature = array("I", bytes(4 * SIGNATURE_SIZE))
+    for i in range(SIGNATURE_SIZE):
+        distance = 0
+        while buckets[(i + distance) % SIGNATURE_SIZE] == EMPTY_BUCKET:
+            distance += 1
+        signature[i] = (buckets[(i + distance) % SIGNATURE_SIZE] + distance * DENSIFY_OFFSET) & 0xFFFFFFFF
+    return signature
+
+def estimated_similarity(a: Signature, b: Signature) -> float:
+    return sum(x == y for x, y in zip(a, b)) / SIGNATURE_SIZE
+
+def cluster_id(post_url: str) -> int:
+    """
+    Cluster key of a near-duplicate group: a signed 64-bit hash of its first post's URL.
+    """
+    return int.from_bytes(hashlib.blake2b(post_url.encode(), digest_size=8).digest(), "little", signed=True)
+
+def _band_keys(signature: Signature) -> List[int]:
+    return [hash(tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])) for band in range(BANDS)]
+
+class NearDuplicateIndex:
+    """
+    LSH index over the MinHash signatures of recent posts. A lookup only compares against posts
+    sharing at least one band, so the cost per post stays flat as the index grows. Every entry
+    carries its cluster id.
+
+    Signatures are not stored: load() rebuilds them from the newest posts' post_text. Until it
+    has run, new posts are only compared against what this process ingested since starting.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[int], AsyncIterator[List[Dict[str, Any]]]],
+        min_similarity: float = NEAR_DUPLICATE_MIN_SIMILARITY,
+        max_size: int = NEAR_DUPLICATE_INDEX_SIZE
+    ):
+        self.loader = loader
+        self.min_similarity = min_similarity
+        self.max_size = max_size
+        self._bands: List[Dict[int, List[Tuple[Signature, int]]]] = [{} for _ in range(BANDS)]
+        self._order: Deque[Tuple[Signature, int, List[int]]] = deque() # Insertion order, for eviction
+        self._lock = threading.Lock() # annotate() and load() run in worker threads
+        self._loaded = False
+        self._loading = False
+        self.duplicates_found = 0
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def _find_cluster(self, signature: Signature, keys: List[int]) -> Optional[int]:
+        best: Optional[Tuple[float, int]] = None # (similarity, cluster)
+        for band, key in enumerate(keys):
+            for candidate, cluster in self._bands[band].get(key, ()):
+                similarity = estimated_similarity(signature, candidate)
+                if similarity >= self.min_similarity and (best is None or similarity > best[0]):
+                    best = (similarity, cluster)
+        return best[1] if best else None
+
+    def _add(self, signature: Signature, cluster: int, keys: List[int]) -> None:
+        entry = (signature, cluster)
+        for band, key in enumerate(keys):
+            self._bands[band].setdefault(key, []).append(entry)
+        self._order.append((signature, cluster, keys))
+
+        while len(self._order) > self.max_size:
+            evicted_signature, evicted_cluster, evicted_keys = self._order.popleft()
+            for band, key in enumerate(evicted_keys):
+                bucket = self._bands[band][key]
+                bucket.remove((evicted_signature, evicted_cluster))
+                if not bucket:
+                    del self._bands[band][key]
+
+    def annotate(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Sets near_duplicate_cluster and is_near_duplicate on new creator_content rows (from their
+        post_url and post_text), in order, so copies within the batch are caught too. A row with
+        no earlier match starts its own cluster; rows too short to compare get none. Returns
+        the number of near-duplicates.
+        """
+        signatures = [minhash_signature(row.get("post_text")) for row in rows]
+        duplicates = 0
+        with self._lock:
+            for row, signature in zip(rows, signatures):
+                if signature is None:
+                    row.update(near_duplicate_cluster=None, is_near_duplicate=False)
+                    continue
+
+                keys = _band_keys(signature)
+                cluster = self._find_cluster(signature, keys)
+                is_duplicate = cluster is not None
+                if cluster is None:
+                    cluster = cluster_id(row["post_url"])
+                self._add(signature, cluster, keys)
+
+                row.update(near_duplicate_cluster=cluster, is_near_duplicate=is_duplicate)
+                duplicates += is_duplicate
+            self.duplicates_found += duplicates
+        return duplicates
+
+    def needs_load(self) -> bool:
+        return not self._loaded and not self._loading
+
+    async def load(self) -> None:
+        """
+        Indexes the newest stored posts, ahead of anything this process ingested meanwhile.
+        Signatures are computed in a worker thread.
+        """
+        if not self.needs_load():
+            return
+        self._loading = True
+        try:
+            stored: List[Dict[str, Any]] = []
+            async for page in self.loader(self.max_size):
+                stored.extend(page)
+            stored.reverse() # Oldest first, so each cluster's first post is indexed first
+
+            def build() -> int:
+                entries = []
+                for row in stored:
+                    signature = minhash_signature(row.get("post_text"))
+                    if signature is not None:
+                        entries.append((signature, row.get("near_duplicate_cluster") or cluster_id(row["post_url"]), _band_keys(signature)))
+                with self._lock:
+                    ingested_meanwhile = list(self._order)
+                    self._bands, self._order = [{} for _ in range(BANDS)], deque()
+                    for signature, cluster, keys in entries + ingested_meanwhile:
+                        self._add(signature, cluster, keys)
+                return len(entries)
+
+            indexed = await asyncio.to_thread(build)
+            self._loaded = True
+            print(f"Loaded {indexed} posts into the near-duplicate index")
+        except Exception as e:
+            print(f"Failed to load the near-duplicate index: {e}")
+        finally:
+            self._loading = False
@@ -1,18 +1,42 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Literal
 from app.models import AuthUser
 from app.services.content import content_service
 from app.dependencies import get_current_user
 
 router = APIRouter()
 
+MEDIA_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson"}
+
 @router.get("/get-all-posts", response_model=List[Dict[str, Any]])
 async def get_all_posts(
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+    current_user: AuthUser = Depends(get_current_user), # Authentication is required
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format", description="json streams a single array, ndjson one row per line")
 ):
+    # The export covers the whole content table, so it is streamed page by page instead of built in memory
+    chunks = content_service.stream_all_creator_content(output_format=output_format)
     try:
-        data = await content_service.get_all_creator_content()
-        return data
+        # Pull the first chunks before responding so database errors still map to a 500
+        prefetched = [await chunks.__anext__()]
+        if output_format == "json":
+            prefetched.append(await chunks.__anext__())
+    except StopAsyncIteration:
+        pass
     except Exception as e:
         print(f"Get all posts error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to get all posts")
+
+    async def body() -> AsyncIterator[str]:
+        for chunk in prefetched:
+            yield chunk
+        try:
+            async for chunk in chunks:
+                yield chunk
+        except Exception as e:
+            # Headers are already sent, so the status can't change. Re-raising aborts the connection
+            # before the final chunk, and the client sees a failed transfer, not a short export.
+            print(f"Get all posts streaming error: {e}")
+            raise
+
+    return StreamingResponse(body(), media_type=MEDIA_TYPES[output_format])
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Dict, Optional
+from app.models import PostProjection, PostStats, PostMedia, Article
+from app.utils import format_post_title
+
+# creator_content columns written from a PostProjection
+PROJECTION_COLUMNS = list(PostProjection.model_fields.keys())
+
+def project_post_data(parsed_post: Dict[str, Any]) -> PostProjection:
+    """
+    Builds the feed projection from a parsed Apify post (the JSON stored in post_raw).
+    """
+    text = parsed_post.get('text') or ''
+
+    stats_data = parsed_post.get('stats')
+    media_data = parsed_post.get('media')
+    article_data = parsed_post.get('article')
+    posted_at_info = parsed_post.get('posted_at') or {}
+
+    # "3d • Edited • 🌐" -> "3d"
+    posted_at_relative = None
+    if posted_at_info.get('relative'):
+        posted_at_relative = posted_at_info['relative'].split('•')[0].strip() or None
+
+    return PostProjection(
+        post_text=text,
+        post_title=format_post_title(text),
+        posted_at_date=posted_at_info.get('date'),
+        posted_at_timestamp=posted_at_info.get('timestamp'),
+        posted_at_relative=posted_at_relative,
+        post_type=parsed_post.get('post_type'),
+        post_stats=PostStats(**stats_data) if stats_data else None,
+        post_media=[PostMedia(**m) for m in media_data] if media_data else None,
+        post_article=Article(**article_data) if article_data else None,
+    )
+
+def project_post_raw(post_raw: Optional[str]) -> PostProjection:
+    """
+    Builds the feed projection from a stored post_raw value, which is either an Apify post
+    serialized as JSON or plain text.
+    """
+    parsed_post: Optional[Dict[str, Any]] = None
+    try:
+        if post_raw and post_raw.strip().startswith('{'):
+            parsed_post = json.loads(post_raw)
+    except json.JSONDecodeError:
+        # Not JSON, treat as plain text
+        pass
+
+    if parsed_post:
+        return project_post_data(parsed_post)
+
+    text = post_raw if post_raw else ''
+    return PostProjection(post_text=text, post_title=format_post_title(text))
+
+def projection_columns(projection: PostProjection) -> Dict[str, Any]:
+    """
+    Serializes a projection into creator_content column values (JSON columns as plain dicts/lists).
+    """
+    return projection.model_dump(mode="json")
@@ -0,0 +1,138 @@
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.models import ConversationMessage, PromptUsage
+
+try:
+    import tiktoken
+except ImportError: # Optional dependency, fall back to a character-based estimate
+    tiktoken = None
+
+# Upper bound on input tokens per completion; older turns and low-priority context are compacted to fit
+OPENAI_INPUT_TOKEN_BUDGET = int(os.getenv("OPENAI_INPUT_TOKEN_BUDGET", "16000"))
+# Most recent conversation messages that are always sent verbatim
+PROMPT_KEEP_RECENT_MESSAGES = int(os.getenv("PROMPT_KEEP_RECENT_MESSAGES", "6"))
+# Per-message framing overhead of the chat format
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_SNIPPET_CHARS = 160
+TRUNCATION_MARKER = "\n[...truncated]"
+
+# Profile fields the prompts rely on most; these are the last context entries to be dropped
+CORE_CONTEXT_FIELDS = {"fullName", "currentTitle", "companyName", "industry"}
+
+# Loaded on first use: tiktoken may download the BPE file, which must not hold up startup
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+def _get_encoding():
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                if tiktoken:
+                    try:
+                        _encoding = tiktoken.get_encoding("o200k_base") # gpt-4o family
+                    except Exception as e:
+                        print(f"Warning: tiktoken encoding unavailable, estimating token counts: {e}")
+                _encoding_loaded = True
+    return _encoding
+
+def count_tokens(text: str) -> int:
+    encoding = _get_encoding()
+    if encoding:
+        return len(encoding.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4 # ~4 characters per token for English text
+
+def count_message_tokens(messages: List[Dict[str, str]]) -> int:
+    return sum(count_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return TRUNCATION_MARKER.strip()
+    encoding = _get_encoding()
+    if encoding:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens]) + TRUNCATION_MARKER
+    max_chars = max_tokens * 4
+    return text if len(text) <= max_chars else text[:max_chars] + TRUNCATION_MARKER
+
+def summarize_messages(messages: List[ConversationMessage]) -> ConversationMessage:
+    """
+    Condenses older conversation turns into one message: each turn is kept as a short snippet,
+    so the model still sees what was asked and answered without the full text.
+    """
+    lines = []
+    for message in messages:
+        snippet = " ".join(message.content.split())
+        if len(snippet) > SUMMARY_SNIPPET_CHARS:
+            snippet = snippet[:SUMMARY_SNIPPET_CHARS] + "..."
+        lines.append(f"- {message.role}: {snippet}")
+    return ConversationMessage(
+        role="user",
+        content=f"(Condensed summary of {len(messages)} earlier messages in this conversation)\n" + "\n".join(lines),
+    )
+
+def fit_prompt(
+    render: Callable[[str, Optional[Dict[str, Any]], List[ConversationMessage]], List[Dict[str, str]]],
+    body: str,
+    context: Optional[Dict[str, Any]],
+    history: List[ConversationMessage],
+    truncate_body: bool,
+    budget: int = OPENAI_INPUT_TOKEN_BUDGET,
+) -> Tuple[List[Dict[str, str]], PromptUsage]:
+    """
+    Renders a prompt with `render(body, context, history)` and shrinks its inputs until the
+    messages fit the input token budget, in this order:
+      1. condense conversation turns older than the most recent ones into a summary
+      2. drop low-priority context fields, longest first
+      3. truncate the body, when `truncate_body` allows it
+    Returns the messages with a PromptUsage describing the token count and what was compacted.
+    Tokenizes the prompt several times, so async callers should run it in a worker thread.
+    """
+    usage = PromptUsage(budget=budget)
+    messages = render(body, context, history)
+    tokens = count_message_tokens(messages)
+
+    # 1. Condense older conversation turns, keeping fewer recent turns verbatim each round
+    keep_recent = PROMPT_KEEP_RECENT_MESSAGES
+    while tokens > budget and keep_recent >= 0 and len(history) > keep_recent:
+        older, recent = history[:len(history) - keep_recent], history[len(history) - keep_recent:]
+        compacted_history = [summarize_messages(older)] + recent
+        messages = render(body, context, compacted_history)
+        tokens = count_message_tokens(messages)
+        usage.summarizedMessages = len(older)
+        keep_recent -= 2
+
+    if usage.summarizedMessages:
+        history = compacted_history
+
+    # 2. Drop non-core context fields, largest first
+    if tokens > budget and context:
+        context = dict(context)
+        droppable = sorted(
+            (key for key in context if key not in CORE_CONTEXT_FIELDS),
+            key=lambda key: len(str(context[key])),
+            reverse=True,
+        )
+        for key in droppable:
+            if tokens <= budget:
+                break
+            del context[key]
+            usage.droppedContextFields.append(key)
+            messages = render(body, context, history)
+            tokens = count_message_tokens(messages)
+
+    # 3. Truncate the body by the remaining overflow
+    if tokens > budget and truncate_body:
+        overflow = tokens - budget
+        body = truncate_to_tokens(body, count_tokens(body) - overflow - count_tokens(TRUNCATION_MARKER))
+        messages = render(body, context, history)
+        tokens = count_message_tokens(messages)
+        usage.bodyTruncated = True
+
+    usage.promptTokens = tokens
+    usage.overBudget = tokens > budget
+    return messages, usage
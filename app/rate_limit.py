@@ -0,0 +1,172 @@
+import asyncio
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import openai
+from fastapi import HTTPException, status
+from app.cache import TTLCache
+
+# Token budgets for the AI endpoints, in estimated model tokens per minute.
+# The global bucket should match the provider quota (TPM) shared by every user of the API key.
+AI_GLOBAL_TOKENS_PER_MINUTE = float(os.getenv("AI_GLOBAL_TOKENS_PER_MINUTE", "200000"))
+AI_USER_TOKENS_PER_MINUTE = float(os.getenv("AI_USER_TOKENS_PER_MINUTE", "40000"))
+# Flat cost per request on top of its size, covering the generated output
+AI_REQUEST_BASE_COST = int(os.getenv("AI_REQUEST_BASE_COST", "500"))
+# Point at a SQLite file to share bucket state between workers on the same host
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH")
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# (key, capacity, refill rate per second)
+Bucket = Tuple[str, float, float]
+
+class RateLimitExceeded(HTTPException):
+    def __init__(self, retry_after: float, detail: str = "Rate limit exceeded, please retry later"):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+
+def upstream_rate_limit_error(error: openai.RateLimitError) -> RateLimitExceeded:
+    """
+    Maps a provider 429 onto our own 429, keeping the provider's Retry-After when it sent one.
+    """
+    retry_after = 1.0
+    try:
+        retry_after = float(error.response.headers.get("retry-after", retry_after))
+    except (AttributeError, TypeError, ValueError):
+        pass
+    return RateLimitExceeded(retry_after, detail="AI provider rate limit reached, please retry later")
+
+def _take(levels: List[Tuple[float, float]], buckets: List[Bucket], cost: float, now: float) -> Tuple[List[float], float]:
+    """
+    Refills each bucket from its (tokens, updated_at) state and takes `cost` from all of them,
+    or from none. Returns the new levels and 0, or the unchanged levels and the seconds until
+    every bucket can cover the cost.
+    """
+    refilled = []
+    wait = 0.0
+    for (tokens, updated_at), (_, capacity, rate) in zip(levels, buckets):
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+        refilled.append(tokens)
+        # A request larger than the bucket only needs the bucket to be full
+        needed = min(cost, capacity)
+        if tokens < needed:
+            wait = max(wait, (needed - tokens) / rate)
+
+    if wait > 0:
+        return refilled, wait
+    return [tokens - min(cost, capacity) for tokens, (_, capacity, _) in zip(refilled, buckets)], 0.0
+
+class TokenBucketStore(ABC):
+    """
+    Storage for token bucket state. `take` must apply to all the given buckets atomically.
+    """
+
+    @abstractmethod
+    async def take(self, buckets: List[Bucket], cost: float) -> float:
+        ...
+
+class MemoryTokenBucketStore(TokenBucketStore):
+    """
+    Per-process bucket state. Idle buckets are evicted once they would have refilled completely.
+    """
+
+    def __init__(self, max_keys: int):
+        self._levels = TTLCache(max_size=max_keys)
+
+    async def take(self, buckets: List[Bucket], cost: float) -> float:
+        now = time.time()
+        levels = [self._levels.get(key) or (capacity, now) for key, capacity, _ in buckets]
+        new_levels, wait = _take(levels, buckets, cost, now)
+        if wait == 0:
+            for tokens, (key, capacity, rate) in zip(new_levels, buckets):
+                self._levels.set(key, (tokens, now), expires_at=now + (capacity - tokens) / rate)
+        return wait
+
+class SQLiteTokenBucketStore(TokenBucketStore):
+    """
+    Bucket state in a SQLite file, shared by every worker process on the host. Each take runs
+    in an IMMEDIATE transaction, so concurrent workers serialize on the buckets they touch.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _take(self, buckets: List[Bucket], cost: float) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                levels = []
+                for key, capacity, _ in buckets:
+                    row = self._conn.execute("SELECT tokens, updated_at FROM token_buckets WHERE key = ?", (key,)).fetchone()
+                    levels.append(row if row else (capacity, now))
+
+                new_levels, wait = _take(levels, buckets, cost, now)
+                if wait == 0:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                        [(key, tokens, now) for tokens, (key, _, _) in zip(new_levels, buckets)],
+                    )
+                self._conn.execute("COMMIT")
+                return wait
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    async def take(self, buckets: List[Bucket], cost: float) -> float:
+        return await asyncio.to_thread(self._take, buckets, cost)
+
+class RateLimiter:
+    """
+    Token-bucket limiter with a bucket per user and one global bucket. A request is admitted
+    only if both buckets can cover its cost; otherwise nothing is taken and the caller gets
+    the time to wait.
+    """
+
+    def __init__(self, store: TokenBucketStore, user_per_minute: float, global_per_minute: float):
+        self.store = store
+        self.user_capacity = user_per_minute
+        self.global_capacity = global_per_minute
+        self.allowed = 0
+        self.limited = 0
+
+    async def acquire(self, user_id: str, cost: float) -> float:
+        """
+        Takes `cost` tokens for the user. Returns 0 when admitted, else seconds until retry.
+        """
+        buckets = [
+            (f"user:{user_id}", self.user_capacity, self.user_capacity / 60),
+            ("global", self.global_capacity, self.global_capacity / 60),
+        ]
+        wait = await self.store.take(buckets, cost)
+        if wait > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> Dict[str, float]:
+        return {"allowed": self.allowed, "limited": self.limited, "userPerMinute": self.user_capacity, "globalPerMinute": self.global_capacity}
+
+def estimate_request_cost(body_size: int) -> int:
+    # ~4 bytes of request body per prompt token, plus the flat output allowance
+    return AI_REQUEST_BASE_COST + body_size // 4
+
+def _create_store(db_path: Optional[str]) -> TokenBucketStore:
+    if db_path:
+        return SQLiteTokenBucketStore(db_path)
+    return MemoryTokenBucketStore(RATE_LIMIT_MAX_KEYS)
+
+# Singleton instance
+ai_rate_limiter = RateLimiter(_create_store(RATE_LIMIT_DB_PATH), AI_USER_TOKENS_PER_MINUTE, AI_GLOBAL_TOKENS_PER_MINUTE)
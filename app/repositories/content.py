@@ -1,22 +1,27 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
 from supabase import Client
+from app.supabase_client import run_query
 from app.models import CreatorContentWithProfile, CreatorContent, CreatorProfileForContent # Import the new models
+from app.utils import chunked
+
+# Upper bound on values per in_ filter / rows per bulk write, keeps request URLs and bodies small
+BULK_CHUNK_SIZE = 100
 
 class ContentRepository:
     def __init__(self, supabase_client: Client):
         self.supabase = supabase_client
 
     async def find_all_with_profiles(
-        self, limit: int = 1000, offset: int = 0
+        self, limit: int = 50, offset: int = 0
     ) -> List[CreatorContentWithProfile]:
-        response = (self.supabase
+        response = await run_query(self.supabase
             .from_("creator_content") 
             .select(
                 "*, creator_profiles!inner(creator_id, profile_url, platform, display_name)"
             ) 
             .order("created_at", desc=True) 
+            .order("content_id", desc=True) 
             .range(offset, offset + limit - 1) 
-            .execute()
         )
         if response.data:
             # Map the response data to CreatorContentWithProfile Pydantic models
@@ -26,25 +31,52 @@ class ContentRepository:
             return [CreatorContentWithProfile(**item) for item in response.data]
         return []
 
+    async def find_page_with_profiles(
+        self, limit: int, after: Optional[Tuple[str, int]] = None, collapse_duplicates: bool = False
+    ) -> List[CreatorContentWithProfile]:
+        """
+        Keyset pagination over (created_at, content_id) descending. `after` is the sort key of
+        the last row of the previous page; the query seeks past it instead of skipping rows.
+        """
+        query = (self.supabase
+            .from_("creator_content")
+            .select(
+                "*, creator_profiles!inner(creator_id, profile_url, platform, display_name)"
+            )
+        )
+        if collapse_duplicates:
+            query = query.eq("is_near_duplicate", False)
+        if after:
+            created_at, content_id = after
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",content_id.lt.{content_id})'
+            )
+        response = await run_query(query
+            .order("created_at", desc=True)
+            .order("content_id", desc=True)
+            .limit(limit)
+        )
+        if response.data:
+            return [CreatorContentWithProfile(**item) for item in response.data]
+        return []
+
     async def find_by_creator_id(self, creator_id: int) -> List[CreatorContent]:
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("creator_content") 
             .select("*") 
             .eq("creator_id", creator_id) 
             .order("content_id", desc=True) 
-            .execute()
         )
         if response.data:
             return [CreatorContent(**item) for item in response.data]
         return []
 
     async def find_by_post_url(self, post_url: str) -> Optional[CreatorContent]:
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("creator_content") 
             .select("*") 
             .eq("post_url", post_url) 
             .single() 
-            .execute()
         )
         if response.data:
             return CreatorContent(**response.data)
@@ -58,24 +90,160 @@ class ContentRepository:
             "post_url": post_url,
             "post_raw": post_raw,
         }
-        response = self.supabase.from_("creator_content").insert(data).execute()
+        response = await run_query(self.supabase.from_("creator_content").insert(data))
         if response.count is None: # Indicates an error or no row inserted
              raise Exception("Failed to create content")
 
+    async def find_existing_post_urls(self, post_urls: List[str]) -> Set[str]:
+        existing: Set[str] = set()
+        for chunk in chunked(post_urls, BULK_CHUNK_SIZE):
+            response = await run_query(self.supabase
+                .from_("creator_content")
+                .select("post_url")
+                .in_("post_url", chunk)
+            )
+            if response.data:
+                existing.update(item["post_url"] for item in response.data)
+        return existing
+
+    async def find_stats_by_post_urls(self, post_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        # post_url -> {content_id, creator_id, post_url, post_stats}
+        rows: Dict[str, Dict[str, Any]] = {}
+        for chunk in chunked(post_urls, BULK_CHUNK_SIZE):
+            response = await run_query(self.supabase
+                .from_("creator_content")
+                .select("content_id, creator_id, post_url, post_stats")
+                .in_("post_url", chunk)
+            )
+            if response.data:
+                rows.update((item["post_url"], item) for item in response.data)
+        return rows
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> None:
+        # Each row holds creator_id, post_url and post_raw; posts already stored under the same post_url are left untouched
+        for chunk in chunked(rows, BULK_CHUNK_SIZE):
+            await run_query(self.supabase.from_("creator_content").upsert(
+                chunk,
+                on_conflict="post_url",
+                ignore_duplicates=True
+            ))
+
+    async def find_unprojected(self, after_content_id: int, limit: int) -> List[Dict[str, Any]]:
+        # Rows ingested before the projection columns existed, paged by content_id for the backfill
+        response = await run_query(self.supabase
+            .from_("creator_content")
+            .select("content_id, creator_id, post_url, post_raw")
+            .is_("post_title", "null")
+            .gt("content_id", after_content_id)
+            .order("content_id")
+            .limit(limit)
+        )
+        if response.data:
+            return response.data
+        return []
+
+    async def update_projections(self, rows: List[Dict[str, Any]]) -> None:
+        # Rows carry content_id, creator_id, post_url and the projection columns; upserting on the
+        # primary key updates every row of a chunk in a single request
+        for chunk in chunked(rows, BULK_CHUNK_SIZE):
+            await run_query(self.supabase.from_("creator_content").upsert(chunk, on_conflict="content_id"))
+
+    async def update_stats(self, rows: List[Dict[str, Any]]) -> None:
+        # Rows carry content_id, creator_id, post_url, post_raw and post_stats; only those columns are rewritten
+        for chunk in chunked(rows, BULK_CHUNK_SIZE):
+            await run_query(self.supabase.from_("creator_content").upsert(chunk, on_conflict="content_id"))
+
     async def count(self) -> int:
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("creator_content") 
             .select("*", count="exact", head=True) 
-            .execute()
         )
         return response.count if response.count is not None else 0
 
-    async def find_all_for_stats(self) -> List[dict]: # Returns raw dicts as per original TS
-        response = (self.supabase 
-            .from_("creator_content") 
-            .select("creator_id, post_raw") 
-            .execute()
+    async def iter_all_raw(self, page_size: int = 500) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields every row's creator_id and post_raw, one page at a time, keyed on content_id so
+        only a single page is ever held in memory.
+        """
+        last_content_id = 0
+        while True:
+            response = await run_query(self.supabase
+                .from_("creator_content")
+                .select("content_id, creator_id, post_raw")
+                .gt("content_id", last_content_id)
+                .order("content_id")
+                .limit(page_size)
+            )
+            if not response.data:
+                return
+
+            last_content_id = response.data[-1]["content_id"]
+            yield [{"creator_id": row["creator_id"], "post_raw": row["post_raw"]} for row in response.data]
+
+            if len(response.data) < page_size:
+                return
+
+    async def iter_post_urls(self, page_size: int = 1000) -> AsyncIterator[List[str]]:
+        # Every stored post_url, a page at a time, keyed on content_id like iter_all_raw
+        last_content_id = 0
+        while True:
+            response = await run_query(self.supabase
+                .from_("creator_content")
+                .select("content_id, post_url")
+                .gt("content_id", last_content_id)
+                .order("content_id")
+                .limit(page_size)
+            )
+            if not response.data:
+                return
+
+            last_content_id = response.data[-1]["content_id"]
+            yield [row["post_url"] for row in response.data]
+
+            if len(response.data) < page_size:
+                return
+
+    async def iter_recent_texts(self, limit: int, page_size: int = 1000) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Yields post_url, post_text and near_duplicate_cluster of the newest `limit` rows, newest
+        first, a page at a time.
+        """
+        last_content_id: Optional[int] = None
+        remaining = limit
+        while remaining > 0:
+            query = (self.supabase
+                .from_("creator_content")
+                .select("content_id, post_url, post_text, near_duplicate_cluster")
+            )
+            if last_content_id is not None:
+                query = query.lt("content_id", last_content_id)
+            response = await run_query(query.order("content_id", desc=True).limit(min(page_size, remaining)))
+            if not response.data:
+                return
+
+            last_content_id = response.data[-1]["content_id"]
+            remaining -= len(response.data)
+            yield response.data
+
+            if len(response.data) < page_size:
+                return
+
+    async def find_unclustered(self, after_content_id: int, limit: int) -> List[Dict[str, Any]]:
+        # Rows ingested before near-duplicate clustering, paged by content_id for the backfill
+        response = await run_query(self.supabase
+            .from_("creator_content")
+            .select("content_id, creator_id, post_url, post_raw, post_text")
+            .is_("near_duplicate_cluster", "null")
+            .not_.is_("post_text", "null")
+            .gt("content_id", after_content_id)
+            .order("content_id")
+            .limit(limit)
         )
         if response.data:
             return response.data
         return []
+
+    async def update_near_duplicates(self, rows: List[Dict[str, Any]]) -> None:
+        # Rows carry content_id, creator_id, post_url, post_raw and the near-duplicate columns
+        for chunk in chunked(rows, BULK_CHUNK_SIZE):
+            await run_query(self.supabase.from_("creator_content").upsert(chunk, on_conflict="content_id"))
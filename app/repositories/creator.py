@@ -1,27 +1,33 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from supabase import Client
+from app.supabase_client import run_query
 from app.models import CreatorProfile
+from app.utils import chunked
+
+# Upper bound on values per in_ filter / rows per bulk write, keeps request URLs and bodies small
+BULK_CHUNK_SIZE = 100
 
 class CreatorRepository:
     def __init__(self, supabase_client: Client):
         self.supabase = supabase_client
 
     async def find_all(self) -> List[CreatorProfile]:
-        response = self.supabase.from_('creator_profiles').select('*').order('created_at', desc=True).execute()
-        # The execute() method returns a PostgrestAPIResponse object
+        response = await run_query(self.supabase.from_('creator_profiles').select('*').order('created_at', desc=True))
+        # run_query() returns the PostgrestAPIResponse object from execute()
         # The data is in response.data
         if response.data:
             return [CreatorProfile(**item) for item in response.data]
         return []
 
     async def find_by_id(self, creator_id: int) -> Optional[CreatorProfile]:
-        response = self.supabase.from_('creator_profiles').select('*').eq('creator_id', creator_id).single().execute()
+        response = await run_query(self.supabase.from_('creator_profiles').select('*').eq('creator_id', creator_id).single())
         if response.data:
             return CreatorProfile(**response.data)
         return None
 
     async def find_by_profile_url(self, profile_url: str) -> Optional[CreatorProfile]:
-        response = self.supabase.from_('creator_profiles').select('*').eq('profile_url', profile_url).single().execute()
+        response = await run_query(self.supabase.from_('creator_profiles').select('*').eq('profile_url', profile_url).single())
         if response.data:
             return CreatorProfile(**response.data)
         return None
@@ -32,7 +38,42 @@ class CreatorRepository:
             "platform": platform,
             "display_name": display_name,
         }
-        response = self.supabase.from_('creator_profiles').insert(data).execute()
+        response = await run_query(self.supabase.from_('creator_profiles').insert(data))
         if response.data:
             return CreatorProfile(**response.data[0])
         raise Exception("Failed to create creator")
+
+    async def find_by_profile_urls(self, profile_urls: List[str]) -> List[CreatorProfile]:
+        creators: List[CreatorProfile] = []
+        for chunk in chunked(profile_urls, BULK_CHUNK_SIZE):
+            response = await run_query(self.supabase.from_('creator_profiles').select('*').in_('profile_url', chunk))
+            if response.data:
+                creators.extend(CreatorProfile(**item) for item in response.data)
+        return creators
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> List[CreatorProfile]:
+        # Rows whose profile_url already exists are skipped (and not returned), so concurrent scrapes can't duplicate creators
+        creators: List[CreatorProfile] = []
+        for chunk in chunked(rows, BULK_CHUNK_SIZE):
+            response = await run_query(self.supabase.from_('creator_profiles').upsert(
+                chunk,
+                on_conflict='profile_url',
+                ignore_duplicates=True
+            ))
+            if response.data:
+                creators.extend(CreatorProfile(**item) for item in response.data)
+        return creators
+
+    async def advance_high_water_marks(self, marks: List[Dict[str, Any]]) -> None:
+        # Each mark holds creator_id, last_post_urn and last_posted_at_timestamp; the function ignores marks older than the stored one
+        for chunk in chunked(marks, BULK_CHUNK_SIZE):
+            await run_query(self.supabase.rpc('advance_creator_high_water_marks', {"marks": chunk}))
+
+    async def find_rescrape_candidates(self) -> List[Dict[str, Any]]:
+        # Followed creators with last_scraped_at, last_posted_at_timestamp, post_count and total_engagement
+        response = await run_query(self.supabase.rpc('find_rescrape_candidates', {}))
+        return response.data or []
+
+    async def mark_scraped(self, creator_ids: List[int], scraped_at: datetime) -> None:
+        for chunk in chunked(creator_ids, BULK_CHUNK_SIZE):
+            await run_query(self.supabase.from_('creator_profiles').update({"last_scraped_at": scraped_at.isoformat()}).in_('creator_id', chunk))
@@ -0,0 +1,45 @@
+from typing import Dict, List
+from supabase import Client
+from app.supabase_client import run_query
+from app.models import CreatorStats
+from app.utils import chunked
+
+# Upper bound on values per in_ filter, keeps request URLs small
+BULK_CHUNK_SIZE = 100
+
+class CreatorStatsRepository:
+    """
+    Reads per-creator engagement aggregates. The creator_stats table is maintained by a trigger
+    on creator_content (see migration 006), so it is always in step with ingested posts.
+    """
+    def __init__(self, supabase_client: Client):
+        self.supabase = supabase_client
+
+    def _map_row_to_stats(self, row: Dict) -> CreatorStats:
+        post_count = row.get("post_count") or 0
+        total_reactions = row.get("total_reactions") or 0
+        total_comments = row.get("total_comments") or 0
+        total_reposts = row.get("total_reposts") or 0
+        return CreatorStats(
+            postCount=post_count,
+            totalReactions=total_reactions,
+            totalComments=total_comments,
+            totalReposts=total_reposts,
+            avgReactions=total_reactions / post_count if post_count else 0.0,
+            avgComments=total_comments / post_count if post_count else 0.0,
+            avgReposts=total_reposts / post_count if post_count else 0.0,
+        )
+
+    async def find_all(self) -> Dict[int, CreatorStats]:
+        response = await run_query(self.supabase.from_("creator_stats").select("*"))
+        if response.data:
+            return {row["creator_id"]: self._map_row_to_stats(row) for row in response.data}
+        return {}
+
+    async def find_by_creator_ids(self, creator_ids: List[int]) -> Dict[int, CreatorStats]:
+        stats: Dict[int, CreatorStats] = {}
+        for chunk in chunked(creator_ids, BULK_CHUNK_SIZE):
+            response = await run_query(self.supabase.from_("creator_stats").select("*").in_("creator_id", chunk))
+            if response.data:
+                stats.update({row["creator_id"]: self._map_row_to_stats(row) for row in response.data})
+        return stats
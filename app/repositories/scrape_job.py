@@ -0,0 +1,151 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from app.models import ScrapeJob, ScrapeResult
+
+class ScrapeJobRepository:
+    """
+    Scrape jobs in a local SQLite file, so queued and running jobs survive a restart and every
+    worker process on the host shares one queue. Jobs are claimed with a conditional UPDATE,
+    so each one runs on exactly one worker.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scrape_jobs ("
+            " job_id TEXT PRIMARY KEY, user_id TEXT NOT NULL, profile_urls TEXT NOT NULL, status TEXT NOT NULL,"
+            " profiles_completed INTEGER NOT NULL DEFAULT 0, posts_scraped INTEGER NOT NULL DEFAULT 0,"
+            " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        try:
+            # Files created before attempts was tracked
+            self._conn.execute("ALTER TABLE scrape_jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        except sqlite3.OperationalError:
+            pass # Already there
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_scrape_jobs_status_created_at ON scrape_jobs(status, created_at)")
+        self._conn.commit()
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor.rowcount
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _to_job(self, row: tuple) -> ScrapeJob:
+        job_id, _, profile_urls, status, profiles_completed, posts_scraped, result, error, created_at, updated_at, attempts = row
+        profile_urls = json.loads(profile_urls)
+        return ScrapeJob(
+            jobId=job_id,
+            status=status,
+            profileUrls=profile_urls,
+            profilesTotal=len(profile_urls),
+            profilesCompleted=profiles_completed,
+            postsScraped=posts_scraped,
+            result=ScrapeResult.model_validate_json(result) if result else None,
+            error=error,
+            attempts=attempts,
+            createdAt=datetime.fromtimestamp(created_at, timezone.utc),
+            updatedAt=datetime.fromtimestamp(updated_at, timezone.utc),
+        )
+
+    async def create(self, user_id: str, profile_urls: List[str]) -> ScrapeJob:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT INTO scrape_jobs (job_id, user_id, profile_urls, status, created_at, updated_at) VALUES (?, ?, ?, 'queued', ?, ?)",
+            (job_id, user_id, json.dumps(profile_urls), now, now),
+        )
+        return await self.find_by_id(job_id)
+
+    async def find_by_id(self, job_id: str, user_id: Optional[str] = None) -> Optional[ScrapeJob]:
+        sql = "SELECT * FROM scrape_jobs WHERE job_id = ?"
+        params: tuple = (job_id,)
+        if user_id is not None:
+            sql += " AND user_id = ?"
+            params += (user_id,)
+        row = await asyncio.to_thread(self._fetchone, sql, params)
+        return self._to_job(row) if row else None
+
+    async def claim_next(self) -> Optional[Tuple[ScrapeJob, str]]:
+        """
+        Marks the oldest queued job as running and returns it with its user id, or None when the
+        queue is empty.
+        """
+        def claim() -> Optional[tuple]:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT job_id, user_id FROM scrape_jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                # Another process may claim it first; only the UPDATE that changes the row wins
+                cursor = self._conn.execute(
+                    "UPDATE scrape_jobs SET status = 'running', updated_at = ? WHERE job_id = ? AND status = 'queued'",
+                    (time.time(), row[0]),
+                )
+                self._conn.commit()
+                return row if cursor.rowcount == 1 else None
+
+        claimed = await asyncio.to_thread(claim)
+        if claimed is None:
+            return None
+        job_id, user_id = claimed
+        return await self.find_by_id(job_id), user_id
+
+    async def touch(self, job_id: str) -> None:
+        # Heartbeat for a running job, see requeue_stale
+        await asyncio.to_thread(self._execute, "UPDATE scrape_jobs SET updated_at = ? WHERE job_id = ?", (time.time(), job_id))
+
+    async def record_progress(self, job_id: str, posts_scraped: int) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE scrape_jobs SET profiles_completed = profiles_completed + 1, posts_scraped = posts_scraped + ?, updated_at = ? WHERE job_id = ?",
+            (posts_scraped, time.time(), job_id),
+        )
+
+    async def finish(self, job_id: str, result: Optional[ScrapeResult] = None, error: Optional[str] = None) -> None:
+        status = "failed" if error else "succeeded"
+        await asyncio.to_thread(
+            self._execute,
+            "UPDATE scrape_jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE job_id = ?",
+            (status, result.model_dump_json() if result else None, error, time.time(), job_id),
+        )
+
+    async def requeue_stale(self, stale_after: float, max_attempts: int) -> Tuple[int, int]:
+        """
+        Puts running jobs without a heartbeat for `stale_after` seconds back in the queue, i.e. jobs
+        whose worker was stopped mid-run. Their progress counters start over. Each interruption
+        uses up an attempt; a job interrupted `max_attempts` times is marked failed instead, so a
+        job that keeps taking its worker down is not retried forever. Returns (requeued, failed).
+        """
+        def requeue() -> Tuple[int, int]:
+            now = time.time()
+            with self._lock:
+                failed = self._conn.execute(
+                    "UPDATE scrape_jobs SET status = 'failed', attempts = attempts + 1, error = ?, updated_at = ?"
+                    " WHERE status = 'running' AND updated_at < ? AND attempts + 1 >= ?",
+                    (f"Interrupted {max_attempts} times, giving up", now, now - stale_after, max_attempts),
+                ).rowcount
+                requeued = self._conn.execute(
+                    "UPDATE scrape_jobs SET status = 'queued', attempts = attempts + 1, profiles_completed = 0, posts_scraped = 0, updated_at = ?"
+                    " WHERE status = 'running' AND updated_at < ?",
+                    (now, now - stale_after),
+                ).rowcount
+                self._conn.commit()
+                return requeued, failed
+
+        return await asyncio.to_thread(requeue)
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional, List
 from supabase import Client
+from app.supabase_client import run_query
 from app.models import UserDataRow
 
 class UserDataRepository:
@@ -8,13 +9,12 @@ class UserDataRepository:
 
     async def find_by_user_id_and_key(self, user_id: str, key: str) -> Optional[Dict[str, Any]]:
         # print(f"[UserDataRepository] Query: userId={user_id}, key={key}")
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("user_data") 
             .select("data") 
             .eq("user_id", user_id) 
             .eq("key", key) 
             .maybe_single() 
-            .execute()
         )
 
         # print(f"[UserDataRepository] Result:", {"data": response.data})
@@ -29,21 +29,21 @@ class UserDataRepository:
             "key": key,
             "data": data,
         }
-        response = self.supabase.from_("user_data").upsert(
+        response = await run_query(self.supabase.from_("user_data").upsert(
             payload,
             on_conflict="user_id,key"
-        ).execute()
+        ))
 
         if response.count is None: # indicates an error or no row found/inserted/updated
              raise Exception("Failed to upsert user data")
 
     async def delete(self, user_id: str, key: str) -> None:
-        response = self.supabase.from_("user_data").delete().eq("user_id", user_id).eq("key", key).execute()
+        response = await run_query(self.supabase.from_("user_data").delete().eq("user_id", user_id).eq("key", key))
         if response.count is None:
             raise Exception("Failed to delete user data or no record found")
 
     async def find_by_user_id_and_key_pattern(self, user_id: str, key_pattern: str) -> List[UserDataRow]:
-        response = self.supabase.from_("user_data").select("*").eq("user_id", user_id).like("key", key_pattern).execute()
+        response = await run_query(self.supabase.from_("user_data").select("*").eq("user_id", user_id).like("key", key_pattern))
         if response.data:
             return [UserDataRow(**item) for item in response.data]
         return []
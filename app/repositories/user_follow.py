@@ -1,6 +1,11 @@
 from typing import List, Optional
 from supabase import Client
+from app.supabase_client import run_query
 from app.models import CreatorProfile, UserFollow
+from app.utils import chunked
+
+# Upper bound on rows per bulk write, keeps request bodies small
+BULK_CHUNK_SIZE = 100
 
 class UserFollowRepository:
     def __init__(self, supabase_client: Client):
@@ -8,12 +13,11 @@ class UserFollowRepository:
 
     async def find_by_user_id_with_profiles(self, user_id: str) -> List[CreatorProfile]:
         # Perform the join with creator_profiles
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_('user_follows') 
             .select('creator_id, created_at, creator_profiles(*)') 
             .eq('user_id', user_id) 
             .order('created_at', desc=True) 
-            .execute()
         )
 
         if response.data:
@@ -29,23 +33,32 @@ class UserFollowRepository:
             "user_id": user_id,
             "creator_id": creator_id,
         }
-        response = self.supabase.from_('user_follows').upsert(data, on_conflict="user_id,creator_id").execute()
+        response = await run_query(self.supabase.from_('user_follows').upsert(data, on_conflict="user_id,creator_id"))
         if response.data:
             return UserFollow(**response.data[0])
         raise Exception("Failed to upsert user follow")
 
+    async def upsert_many(self, user_id: str, creator_ids: List[int]) -> List[UserFollow]:
+        data = [{"user_id": user_id, "creator_id": creator_id} for creator_id in creator_ids]
+        follows: List[UserFollow] = []
+        for chunk in chunked(data, BULK_CHUNK_SIZE):
+            response = await run_query(self.supabase.from_('user_follows').upsert(chunk, on_conflict="user_id,creator_id"))
+            if response.data:
+                follows.extend(UserFollow(**item) for item in response.data)
+        return follows
+
     async def delete(self, user_id: str, creator_id: int) -> None:
-        response = self.supabase.from_('user_follows').delete().eq('user_id', user_id).eq('creator_id', creator_id).execute()
+        response = await run_query(self.supabase.from_('user_follows').delete().eq('user_id', user_id).eq('creator_id', creator_id))
         # Supabase client delete doesn't return data, just checks for errors
         if response.count is None: # indicates an error or no row found/deleted
              raise Exception("Failed to delete user follow or no record found")
 
     async def find_creator_ids_by_user_id(self, user_id: str) -> List[int]:
-        response = self.supabase.from_('user_follows').select('creator_id').eq('user_id', user_id).execute()
+        response = await run_query(self.supabase.from_('user_follows').select('creator_id').eq('user_id', user_id))
         if response.data:
             return [item['creator_id'] for item in response.data]
         return []
 
     async def exists(self, user_id: str, creator_id: int) -> bool:
-        response = self.supabase.from_('user_follows').select('user_id').eq('user_id', user_id).eq('creator_id', creator_id).maybe_single().execute()
+        response = await run_query(self.supabase.from_('user_follows').select('user_id').eq('user_id', user_id).eq('creator_id', creator_id).maybe_single())
         return response.data is not None
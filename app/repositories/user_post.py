@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from supabase import Client
+from app.supabase_client import run_query
 from app.models import UserPost
 
 class UserPostRepository:
@@ -26,12 +27,11 @@ class UserPostRepository:
         return UserPost(**mapped_data)
 
     async def find_by_user_id(self, user_id: str) -> List[UserPost]:
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("user_posts") 
             .select("*") 
             .eq("user_id", user_id) 
             .order("updated_at", desc=True) 
-            .execute()
         )
 
         if response.data:
@@ -39,12 +39,11 @@ class UserPostRepository:
         return []
 
     async def find_by_id(self, post_id: str) -> Optional[UserPost]:
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("user_posts") 
             .select("*") 
             .eq("post_id", post_id) 
             .maybe_single() 
-            .execute()
         )
 
         if response.data:
@@ -59,12 +58,11 @@ class UserPostRepository:
         if status:
             payload["status"] = status
 
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("user_posts") 
             .insert(payload) 
             .select("*") 
             .single() 
-            .execute()
         )
 
         if response.data:
@@ -81,13 +79,12 @@ class UserPostRepository:
             payload["status"] = status
         payload["updated_at"] = datetime.now().isoformat() # Update timestamp
 
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("user_posts") 
             .update(payload) 
             .eq("post_id", post_id) 
             .select("*") 
             .single() 
-            .execute()
         )
         
         if response.data:
@@ -95,11 +92,10 @@ class UserPostRepository:
         raise Exception("Failed to update post")
 
     async def delete(self, post_id: str) -> None:
-        response = (self.supabase 
+        response = await run_query(self.supabase 
             .from_("user_posts") 
             .delete() 
             .eq("post_id", post_id) 
-            .execute()
         )
         if response.count is None: # indicates an error or no row found/deleted
              raise Exception("Failed to delete post or no record found")
@@ -1,17 +1,14 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from typing import List, Dict, Any
-from app.models import LinkedInScrapeRequest, ScrapeResult, AuthUser
+from app.models import LinkedInScrapeRequest, ScrapeJob, ScrapeResult, AuthUser
 from app.services.linkedin_scraper import linked_in_scraper_service
+from app.services.scrape_jobs import scrape_job_service
 from app.dependencies import get_current_user
 import re
 
 router = APIRouter()
 
-@router.post("/linkedin", response_model=ScrapeResult)
-async def scrape_linkedin(
-    body: LinkedInScrapeRequest,
-    current_user: AuthUser = Depends(get_current_user) # Authentication is required
-):
+def _validate_scrape_request(body: LinkedInScrapeRequest) -> None:
     # Validate profileUrls array - already done by Pydantic model min_length and max_length
     # Validate each URL
     for url in body.profileUrls:
@@ -28,6 +25,13 @@ async def scrape_linkedin(
             detail="APIFY_API_TOKEN is not configured, LinkedIn scraping service is unavailable."
         )
 
+@router.post("/linkedin", response_model=ScrapeResult)
+async def scrape_linkedin(
+    body: LinkedInScrapeRequest,
+    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+):
+    _validate_scrape_request(body)
+
     try:
         result = await linked_in_scraper_service.scrape_profiles(body.profileUrls, current_user.id)
         return result
@@ -36,3 +40,34 @@ async def scrape_linkedin(
     except Exception as e:
         print(f"LinkedIn scrape error: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to scrape LinkedIn profiles")
+
+@router.post("/linkedin/jobs", response_model=ScrapeJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_scrape_job(
+    body: LinkedInScrapeRequest,
+    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+):
+    # Queues the scrape and returns immediately; poll GET /linkedin/jobs/{jobId} for progress
+    _validate_scrape_request(body)
+
+    try:
+        return await scrape_job_service.submit(current_user.id, body.profileUrls)
+    except Exception as e:
+        print(f"Create scrape job error: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to queue LinkedIn scrape")
+
+@router.get("/linkedin/jobs/{job_id}", response_model=ScrapeJob)
+async def get_scrape_job(
+    job_id: str,
+    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+):
+    job = await scrape_job_service.get(job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scrape job not found")
+    return job
+
+@router.get("/apify-stats")
+async def apify_stats(
+    current_user: AuthUser = Depends(get_current_user) # Authentication is required
+):
+    # Per-attempt outcomes, retries and circuit breaker state of the Apify client
+    return linked_in_scraper_service.apify.stats()
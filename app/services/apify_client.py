@@ -0,0 +1,240 @@
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+import httpx
+
+# Connection pool shared by every Apify call; keep-alive saves a TLS handshake per dataset page
+APIFY_MAX_CONNECTIONS = int(os.getenv("APIFY_MAX_CONNECTIONS", "20"))
+APIFY_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("APIFY_MAX_KEEPALIVE_CONNECTIONS", "10"))
+APIFY_KEEPALIVE_SECONDS = float(os.getenv("APIFY_KEEPALIVE_SECONDS", "30"))
+# Retries after the first attempt, with full-jitter exponential backoff between them
+APIFY_MAX_RETRIES = int(os.getenv("APIFY_MAX_RETRIES", "4"))
+APIFY_RETRY_BASE_SECONDS = float(os.getenv("APIFY_RETRY_BASE_SECONDS", "1"))
+APIFY_RETRY_MAX_SECONDS = float(os.getenv("APIFY_RETRY_MAX_SECONDS", "30"))
+# Consecutive failed attempts that open the circuit, and how long it stays open before a probe
+APIFY_BREAKER_FAILURES = int(os.getenv("APIFY_BREAKER_FAILURES", "5"))
+APIFY_BREAKER_RESET_SECONDS = float(os.getenv("APIFY_BREAKER_RESET_SECONDS", "60"))
+
+# Rejected before any work was done, safe to retry for any request
+REJECTED_STATUS_CODES = {429, 503}
+# May have been processed upstream, only retried for idempotent requests
+TRANSIENT_STATUS_CODES = {500, 502, 504}
+
+class ApifyUnavailable(Exception):
+    """
+    Raised without calling Apify while the circuit breaker is open.
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Apify circuit open, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for `reset_timeout`
+    seconds. Then a single probe call is let through: success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._probing = False
+
+    def before_call(self) -> None:
+        if self.state == "closed":
+            return
+        remaining = self.opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0:
+            raise ApifyUnavailable(remaining)
+        if self._probing:
+            # Another call is already probing, hold everything else until it reports back
+            raise ApifyUnavailable(1.0)
+        self.state = "half_open"
+        self._probing = True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probing = False
+
+    def release_probe(self) -> None:
+        # The probe ended without an outcome (cancelled mid-call); let the next call probe instead
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                print(f"Apify circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutiveFailures": self.consecutive_failures,
+            "timesOpened": self.times_opened,
+        }
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    # Retry-After is either delta-seconds or an HTTP date
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class ApifyClient:
+    """
+    HTTP client for the Apify API. Adds the token to every request, retries transient failures
+    with jittered exponential backoff (waiting at least as long as Retry-After asks), and fails
+    fast through a circuit breaker while Apify keeps failing.
+
+    request() returns the last response even when it is an error, so callers keep using
+    raise_for_status(); request errors are re-raised once retries are exhausted.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        token: Optional[str],
+        max_connections: int = APIFY_MAX_CONNECTIONS,
+        max_keepalive_connections: int = APIFY_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = APIFY_KEEPALIVE_SECONDS,
+        max_retries: int = APIFY_MAX_RETRIES,
+        retry_base: float = APIFY_RETRY_BASE_SECONDS,
+        retry_max: float = APIFY_RETRY_MAX_SECONDS,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.breaker = breaker or CircuitBreaker(APIFY_BREAKER_FAILURES, APIFY_BREAKER_RESET_SECONDS)
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self.requests = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.short_circuited = 0
+        self.total_attempt_time = 0.0
+        self.outcomes: Dict[str, int] = {} # Per attempt: status code or transport error name
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+
+    def _record_attempt(self, outcome: str, elapsed: float) -> None:
+        self.attempts += 1
+        self.total_attempt_time += elapsed
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        timeout: float = 30.0,
+        idempotent: bool = True
+    ) -> httpx.Response:
+        """
+        Sends `method` to `path` (relative to the API root). Set `idempotent=False` for calls that
+        must not run twice, such as starting an actor run: those are only retried when Apify
+        rejected them outright (429/503) or the connection was never established.
+        """
+        self.requests += 1
+        url = f"{self.base_url}{path}"
+        params = {**(params or {}), "token": self.token}
+
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+            except ApifyUnavailable:
+                self.short_circuited += 1
+                raise
+
+            started = time.monotonic()
+            try:
+                response = await self.http_client.request(method, url, params=params, json=json, timeout=httpx.Timeout(timeout))
+            except httpx.RequestError as e:
+                self._record_attempt(type(e).__name__, time.monotonic() - started)
+                self.breaker.record_failure()
+                # Connect failures never reached Apify; anything later may have
+                retryable = idempotent or isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if not retryable or attempt >= self.max_retries or self.breaker.state == "open":
+                    self.failures += 1
+                    raise
+                delay = self._backoff(attempt)
+                print(f"Apify {method} {path} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+            except BaseException:
+                # Cancelled (e.g. by the scrape's run deadline) or failed outside httpx: no verdict on Apify
+                self.breaker.release_probe()
+                raise
+            else:
+                self._record_attempt(str(response.status_code), time.monotonic() - started)
+                retryable = response.status_code in REJECTED_STATUS_CODES or (idempotent and response.status_code in TRANSIENT_STATUS_CODES)
+                if not retryable:
+                    # 4xx other than 429 are our fault, not Apify's, and do not count against the circuit
+                    self.breaker.record_success()
+                    if response.is_error:
+                        self.failures += 1
+                    return response
+                self.breaker.record_failure()
+                if attempt >= self.max_retries or self.breaker.state == "open":
+                    self.failures += 1
+                    return response
+                delay = self._backoff(attempt)
+                retry_after = _retry_after_seconds(response)
+                if retry_after is not None:
+                    if retry_after > self.retry_max:
+                        # Not worth holding a scrape open that long, give up now
+                        self.failures += 1
+                        return response
+                    delay = max(delay, retry_after)
+                print(f"Apify {method} {path} returned {response.status_code}, retrying in {delay:.1f}s")
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(delay)
+
+    async def get(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", path, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "failures": self.failures,
+            "shortCircuited": self.short_circuited,
+            "avgAttemptMs": round(self.total_attempt_time / self.attempts * 1000, 1) if self.attempts else 0.0,
+            "outcomes": dict(self.outcomes),
+            "circuit": self.breaker.stats(),
+        }
@@ -1,103 +1,101 @@
 import json
-from typing import List, Dict, Any, Optional
+import os
+from typing import AsyncIterator, List, Dict, Any, Optional
 from datetime import datetime
-from app.models import ContentPost, CreatorContentWithProfile, PostStats, PostMedia, Article, CreatorProfile
+from app.models import ContentPage, ContentPost, CreatorContentWithProfile, CreatorProfile, PostProjection
 from app.repositories.content import ContentRepository
 from app.repositories.creator import CreatorRepository
+from app.repositories.creator_stats import CreatorStatsRepository
 from app.repositories.user_follow import UserFollowRepository
+from app.projection import project_post_raw
 from app.supabase_client import supabase_service_client
-from app.utils import format_post_title, format_time_ago, extract_name_from_url
+from app.utils import format_time_ago, extract_name_from_url, encode_cursor, decode_cursor
+
+# Rows fetched per round trip when streaming the full content export
+EXPORT_PAGE_SIZE = int(os.getenv("CONTENT_EXPORT_PAGE_SIZE", "500"))
 
 class ContentService:
     def __init__(
         self,
         content_repo: ContentRepository,
         creator_repo: CreatorRepository,
-        user_follow_repo: UserFollowRepository
+        user_follow_repo: UserFollowRepository,
+        creator_stats_repo: CreatorStatsRepository
     ):
         self.content_repo = content_repo
         self.creator_repo = creator_repo
         self.user_follow_repo = user_follow_repo
+        self.creator_stats_repo = creator_stats_repo
 
-    async def fetch_creator_content(self, limit: int = 1000, offset: int = 0) -> List[ContentPost]:
+    async def fetch_creator_content(self, limit: int = 50, offset: int = 0) -> List[ContentPost]:
         data = await self.content_repo.find_all_with_profiles(limit=limit, offset=offset)
+        posts = [self._to_content_post(item) for item in data]
 
-        posts: List[ContentPost] = []
-        for item in data:
-            parsed_post: Optional[Dict[str, Any]] = None
-            text = ""
-            stats: Optional[PostStats] = None
-            media: Optional[List[PostMedia]] = None
-            article: Optional[Article] = None
-            posted_at_date: Optional[str] = None
-            posted_at_timestamp: Optional[int] = None
-            post_type: Optional[str] = None
-
-            try:
-                if item.post_raw and item.post_raw.strip().startswith('{'):
-                    parsed_post = json.loads(item.post_raw)
-            except json.JSONDecodeError:
-                # Not JSON, treat as plain text
-                pass
-
-            if parsed_post:
-                text = parsed_post.get('text', '')
-                stats_data = parsed_post.get('stats')
-                if stats_data:
-                    stats = PostStats(**stats_data)
-                
-                media_data = parsed_post.get('media')
-                if media_data:
-                    media = [PostMedia(**m) for m in media_data]
-
-                article_data = parsed_post.get('article')
-                if article_data:
-                    article = Article(**article_data)
-
-                posted_at_info = parsed_post.get('posted_at')
-                if posted_at_info:
-                    posted_at_date = posted_at_info.get('date')
-                    posted_at_timestamp = posted_at_info.get('timestamp')
-                post_type = parsed_post.get('post_type')
-            else:
-                text = item.post_raw if item.post_raw else ''
-
-            author = item.creator_profiles.display_name or extract_name_from_url(item.creator_profiles.profile_url)
-            
-            # Use original created_at if postedAtTimestamp is not available from parsed_post
-            effective_posted_at_timestamp = posted_at_timestamp if posted_at_timestamp is not None else int(item.created_at.timestamp() * 1000)
-            
-            # Use parsed_post relative if available, else format item.created_at
-            time_ago_str = None
-            if parsed_post and parsed_post.get('posted_at') and parsed_post.get('posted_at').get('relative'):
-                time_ago_parts = parsed_post['posted_at']['relative'].split('•')
-                if time_ago_parts:
-                    time_ago_str = time_ago_parts[0].strip()
-            
-            if time_ago_str is None:
-                time_ago_str = format_time_ago(item.created_at.isoformat())
-
-            posts.append(ContentPost(
-                id=item.content_id,
-                title=format_post_title(text),
-                author=author,
-                timeAgo=time_ago_str,
-                isHighlighted=False, # Default as per TS
-                creatorId=item.creator_id,
-                postUrl=item.post_url,
-                postRaw=text,
-                text=text,
-                postedAt=posted_at_date,
-                postedAtTimestamp=effective_posted_at_timestamp,
-                postType=post_type,
-                stats=stats,
-                media=media,
-                article=article,
-            ))
-        
         # Sort by LinkedIn post date (newest first)
         return sorted(posts, key=lambda p: p.postedAtTimestamp if p.postedAtTimestamp is not None else 0, reverse=True)
 
+    async def fetch_creator_content_page(self, limit: int = 20, cursor: Optional[str] = None, collapse_duplicates: bool = False) -> ContentPage:
+        """
+        Cursor-paginated feed. Rows are served in (created_at, content_id) order with no
+        per-page re-sorting, so concatenated pages form one consistent sequence.
+        With `collapse_duplicates`, only the first post of each near-duplicate cluster is served.
+        """
+        after = decode_cursor(cursor) if cursor else None
+
+        # Fetch one extra row to learn whether another page exists
+        data = await self.content_repo.find_page_with_profiles(limit=limit + 1, after=after, collapse_duplicates=collapse_duplicates)
+        has_more = len(data) > limit
+        data = data[:limit]
+
+        next_cursor = encode_cursor(data[-1].created_at, data[-1].content_id) if has_more else None
+        return ContentPage(posts=[self._to_content_post(item) for item in data], nextCursor=next_cursor)
+
+    def _to_content_post(self, item: CreatorContentWithProfile) -> ContentPost:
+        # Rows ingested (or backfilled) since the projection columns exist are served as-is;
+        # older rows are parsed from post_raw on the fly
+        if item.post_title is not None:
+            projection = PostProjection(
+                post_text=item.post_text or '',
+                post_title=item.post_title,
+                posted_at_date=item.posted_at_date,
+                posted_at_timestamp=item.posted_at_timestamp,
+                posted_at_relative=item.posted_at_relative,
+                post_type=item.post_type,
+                post_stats=item.post_stats,
+                post_media=item.post_media,
+                post_article=item.post_article,
+            )
+        else:
+            projection = project_post_raw(item.post_raw)
+
+        author = item.creator_profiles.display_name or extract_name_from_url(item.creator_profiles.profile_url)
+
+        # Use original created_at if the LinkedIn post timestamp is not available
+        effective_posted_at_timestamp = projection.posted_at_timestamp if projection.posted_at_timestamp is not None else int(item.created_at.timestamp() * 1000)
+
+        # Use the scraped relative date if available, else format item.created_at
+        time_ago_str = projection.posted_at_relative or format_time_ago(item.created_at.isoformat())
+
+        return ContentPost(
+            id=item.content_id,
+            title=projection.post_title,
+            author=author,
+            timeAgo=time_ago_str,
+            isHighlighted=False, # Default as per TS
+            creatorId=item.creator_id,
+            postUrl=item.post_url,
+            postRaw=projection.post_text,
+            text=projection.post_text,
+            postedAt=projection.posted_at_date,
+            postedAtTimestamp=effective_posted_at_timestamp,
+            postType=projection.post_type,
+            stats=projection.post_stats,
+            media=projection.post_media,
+            article=projection.post_article,
+            duplicateCluster=str(item.near_duplicate_cluster) if item.near_duplicate_cluster is not None else None,
+            isNearDuplicate=item.is_near_duplicate,
+        )
+
     async def save_content(self, creator_id: int, post_url: str, post_raw: Optional[str] = None) -> None:
         return await self.content_repo.create(creator_id, post_url, post_raw)
 
@@ -120,28 +118,8 @@ class ContentService:
             except Exception as e:
                 print(f"Failed to load followed creators: {e}")
 
-        # Fetch posts with stats for each creator
-        content_data = await self.content_repo.find_all_for_stats()
-
-        # Business logic: Calculate post counts and average stats per creator
-        creator_stats = {} # type: Dict[int, Dict[str, Any]]
-
-        if content_data:
-            for item in content_data:
-                creator_id = item['creator_id']
-                existing = creator_stats.get(creator_id, {'count': 0, 'totalReactions': 0, 'totalComments': 0, 'totalReposts': 0})
-                existing['count'] += 1
-
-                if item['post_raw'] and item['post_raw'].strip().startswith('{'):
-                    try:
-                        parsed = json.loads(item['post_raw'])
-                        if parsed.get('stats'):
-                            existing['totalReactions'] += parsed['stats'].get('total_reactions', 0)
-                            existing['totalComments'] += parsed['stats'].get('comments', 0)
-                            existing['totalReposts'] += parsed['stats'].get('reposts', 0)
-                    except json.JSONDecodeError:
-                        pass
-                creator_stats[creator_id] = existing
+        # Per-creator aggregates are maintained incrementally in creator_stats as posts are ingested
+        creator_stats = await self.creator_stats_repo.find_all()
 
         # Transform database model to UI model, enriching with follow status and stats
         # Note: The original TypeScript returns a `Profile` type which is a blend of CreatorProfile and follow/stats data.
@@ -155,19 +133,35 @@ class ContentService:
                 display_name=creator.display_name,
                 platform=creator.platform,
                 created_at=creator.created_at,
+                stats=creator_stats.get(creator.creator_id),
                 # isFollowed=followed_creators_map.has_key(creator.creator_id), # Not directly in CreatorProfile
-                # postCount=creator_stats.get(creator.creator_id, {}).get('count', 0),
-                # avgReactions=creator_stats.get(creator.creator_id, {}).get('totalReactions', 0)
             )
             for creator in data
         ]
 
-    async def get_all_creator_content(self) -> List[Dict[str, Any]]: # Returns raw dicts as per original TS
-        data = await self.content_repo.find_all_for_stats()
-        return data
+    async def stream_all_creator_content(self, output_format: str = "json") -> AsyncIterator[str]:
+        """
+        Streams every creator_id/post_raw row (the raw export shape of the original TS) as text chunks,
+        either as one JSON array or as NDJSON, paging through the table server-side.
+        """
+        first = True
+        if output_format == "json":
+            yield "["
+
+        async for page in self.content_repo.iter_all_raw(page_size=EXPORT_PAGE_SIZE):
+            if output_format == "ndjson":
+                yield "".join(json.dumps(row) + "\n" for row in page)
+            else:
+                chunk = ",".join(json.dumps(row) for row in page)
+                yield chunk if first else "," + chunk
+                first = False
+
+        if output_format == "json":
+            yield "]"
 
 # Singleton instance with injected repositories
 content_repository = ContentRepository(supabase_service_client)
 creator_repository = CreatorRepository(supabase_service_client)
 user_follow_repository = UserFollowRepository(supabase_service_client)
-content_service = ContentService(content_repository, creator_repository, user_follow_repository)
+creator_stats_repository = CreatorStatsRepository(supabase_service_client)
+content_service = ContentService(content_repository, creator_repository, user_follow_repository, creator_stats_repository)
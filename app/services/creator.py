@@ -1,19 +1,36 @@
 from typing import List, Dict, Any
-from app.models import CreatorProfile, UserFollow
+from app.models import CreatorProfile, CreatorStats, UserFollow
 from app.repositories.creator import CreatorRepository
+from app.repositories.creator_stats import CreatorStatsRepository
 from app.repositories.user_follow import UserFollowRepository
 from app.supabase_client import supabase_service_client
 
 class CreatorService:
-    def __init__(self, creator_repo: CreatorRepository, user_follow_repo: UserFollowRepository):
+    def __init__(
+        self,
+        creator_repo: CreatorRepository,
+        user_follow_repo: UserFollowRepository,
+        creator_stats_repo: CreatorStatsRepository
+    ):
         self.creator_repo = creator_repo
         self.user_follow_repo = user_follow_repo
+        self.creator_stats_repo = creator_stats_repo
 
     async def get_all_creators(self) -> List[CreatorProfile]:
-        return await self.creator_repo.find_all()
+        creators = await self.creator_repo.find_all()
+        stats_by_creator = await self.creator_stats_repo.find_all()
+        return self._with_stats(creators, stats_by_creator)
 
     async def get_followed_creators_with_profiles(self, user_id: str) -> List[CreatorProfile]:
-        return await self.user_follow_repo.find_by_user_id_with_profiles(user_id)
+        creators = await self.user_follow_repo.find_by_user_id_with_profiles(user_id)
+        creator_ids = [c.creator_id for c in creators if c.creator_id is not None]
+        stats_by_creator = await self.creator_stats_repo.find_by_creator_ids(creator_ids)
+        return self._with_stats(creators, stats_by_creator)
+
+    def _with_stats(self, creators: List[CreatorProfile], stats_by_creator: Dict[int, CreatorStats]) -> List[CreatorProfile]:
+        for creator in creators:
+            creator.stats = stats_by_creator.get(creator.creator_id)
+        return creators
 
     async def follow_creator(self, user_id: str, creator_id: int) -> Dict[str, Any]:
         data = await self.user_follow_repo.upsert(user_id, creator_id)
@@ -26,4 +43,5 @@ class CreatorService:
 # Singleton instance with injected repositories
 creator_repository = CreatorRepository(supabase_service_client)
 user_follow_repository = UserFollowRepository(supabase_service_client)
-creator_service = CreatorService(creator_repository, user_follow_repository)
\ No newline at end of file
+creator_stats_repository = CreatorStatsRepository(supabase_service_client)
+creator_service = CreatorService(creator_repository, user_follow_repository, creator_stats_repository)
@@ -1,17 +1,41 @@
+import asyncio
 import os
 import re
 import json
-from typing import List, Dict, Any, Optional
+from typing import Awaitable, Callable, List, Dict, Any, Optional, Tuple
 import httpx
+from app.known_posts import KnownPostUrls
 from app.models import (
     ApiMaestroPost, ScrapeResult, CreatorProfile, CreatorContent, UserFollow
 )
+from app.near_duplicates import NearDuplicateIndex
+from app.projection import project_post_data, projection_columns
 from app.repositories.creator import CreatorRepository
 from app.repositories.content import ContentRepository
 from app.repositories.user_follow import UserFollowRepository
+from app.services.apify_client import ApifyClient, ApifyUnavailable
 from app.supabase_client import supabase_service_client
 
 APIFY_ACTOR_ID = "apimaestro~linkedin-profile-posts"
+# Point at a local stand-in (scripts/apify_stub_server.py) to exercise the ingest without Apify
+APIFY_BASE_URL = os.getenv("APIFY_BASE_URL", "https://api.apify.com").rstrip("/")
+# "sync": one run-sync-get-dataset-items call per profile, everything is saved at the end.
+# "pipelined": async actor runs whose dataset pages stream into the save pipeline as they arrive.
+APIFY_INGEST_MODE = os.getenv("APIFY_INGEST_MODE", "sync")
+APIFY_DATASET_PAGE_SIZE = int(os.getenv("APIFY_DATASET_PAGE_SIZE", "100"))
+# Long-poll window of each run status request while a run has produced no new items
+APIFY_RUN_POLL_SECONDS = int(os.getenv("APIFY_RUN_POLL_SECONDS", "30"))
+# Pages fetched but not yet saved; a full queue pauses the fetchers until the database catches up
+APIFY_PIPELINE_QUEUE_SIZE = int(os.getenv("APIFY_PIPELINE_QUEUE_SIZE", "8"))
+APIFY_TERMINAL_RUN_STATUSES = {"SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT"}
+# Maximum number of concurrent actor runs per scrape, and the wall-clock budget for the whole fan-out
+APIFY_MAX_CONCURRENCY = int(os.getenv("APIFY_MAX_CONCURRENCY", "5"))
+APIFY_RUN_DEADLINE_SECONDS = float(os.getenv("APIFY_RUN_DEADLINE_SECONDS", "600"))
+
+# Called with (profile_url, posts fetched for it) as each profile finishes
+ProgressCallback = Callable[[str, int], Awaitable[None]]
+# A dataset page of a profile, or (profile_url, None) once all of the profile's pages are queued
+PipelineItem = Tuple[str, Optional[List[ApiMaestroPost]]]
 
 class LinkedInScraperService:
     def __init__(
@@ -19,19 +43,43 @@ class LinkedInScraperService:
         apify_token: str,
         creator_repo: CreatorRepository,
         content_repo: ContentRepository,
-        user_follow_repo: UserFollowRepository
+        user_follow_repo: UserFollowRepository,
+        max_concurrency: int = APIFY_MAX_CONCURRENCY,
+        run_deadline: float = APIFY_RUN_DEADLINE_SECONDS,
+        ingest_mode: str = APIFY_INGEST_MODE,
+        known_post_urls: Optional[KnownPostUrls] = None,
+        near_duplicates: Optional[NearDuplicateIndex] = None
     ):
         self.apify_token = apify_token
         self.creator_repo = creator_repo
         self.content_repo = content_repo
         self.user_follow_repo = user_follow_repo
-        self.http_client = httpx.AsyncClient()
-
-    async def scrape_profiles(self, profile_urls: List[str], user_id: str) -> ScrapeResult:
+        self.max_concurrency = max_concurrency
+        self.run_deadline = run_deadline
+        self.ingest_mode = ingest_mode
+        self.known_post_urls = known_post_urls
+        self.near_duplicates = near_duplicates
+        self.apify = ApifyClient(APIFY_BASE_URL, apify_token)
+
+    async def scrape_profiles(
+        self,
+        profile_urls: List[str],
+        user_id: Optional[str],
+        on_progress: Optional[ProgressCallback] = None,
+        refresh_stats: bool = False
+    ) -> ScrapeResult:
+        """
+        Fetches the profiles' posts and stores the ones newer than each creator's high-water mark.
+        With `refresh_stats`, engagement stats of already-stored posts are updated where they changed.
+        Without a `user_id` (scheduled re-scrapes) nobody is auto-followed.
+        """
         if not profile_urls:
             raise ValueError("Profile URLs are required")
 
-        all_posts = await self._fetch_posts_from_apify(profile_urls)
+        if self.ingest_mode == "pipelined":
+            return await self._scrape_pipelined(profile_urls, user_id, on_progress, refresh_stats)
+
+        all_posts = await self._fetch_posts_from_apify(profile_urls, on_progress)
 
         if not all_posts:
             return ScrapeResult(
@@ -41,54 +89,261 @@ class LinkedInScraperService:
                 urlsSent=profile_urls,
             )
 
-        await self._save_posts_and_auto_follow(all_posts, user_id)
+        new_posts, stats_refreshed = await self._save_posts_and_auto_follow(all_posts, user_id, refresh_stats)
 
         return ScrapeResult(
             success=True,
             postsScraped=len(all_posts),
+            newPosts=new_posts,
+            statsRefreshed=stats_refreshed if refresh_stats else None,
             posts=all_posts[:5],  # Return first 5 for debugging
         )
 
-    async def _fetch_posts_from_apify(self, profile_urls: List[str]) -> List[ApiMaestroPost]:
+    async def _fetch_posts_from_apify(self, profile_urls: List[str], on_progress: Optional[ProgressCallback] = None) -> List[ApiMaestroPost]:
         all_posts: List[ApiMaestroPost] = []
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch_with_limit(profile_url: str) -> List[ApiMaestroPost]:
+            async with semaphore:
+                posts = await self._fetch_profile_posts(profile_url)
+            await self._report_progress(on_progress, profile_url, len(posts))
+            return posts
 
-        for profile_url in profile_urls:
-            url_match = re.search(r"linkedin\.com/in/([^\/\?]+)", profile_url)
-            username = url_match.group(1) if url_match else profile_url
+        # Fan out one task per profile; the semaphore bounds how many actor runs are in flight
+        tasks = {asyncio.create_task(fetch_with_limit(url)): url for url in profile_urls}
+        done, pending = await asyncio.wait(tasks.keys(), timeout=self.run_deadline)
 
-            input_body = {"username": username}
+        for task in pending:
+            task.cancel()
+            print(f"Apify fetch for {self._username_from_url(tasks[task])} cancelled: exceeded run deadline of {self.run_deadline}s")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
-            apify_url = f"https://api.apify.com/v2/acts/{APIFY_ACTOR_ID}/run-sync-get-dataset-items?token={self.apify_token}"
+        # Merge in request order so results are deterministic regardless of completion order
+        for task in tasks:
+            if task in done:
+                all_posts.extend(task.result())
+
+        return all_posts
+
+    async def _report_progress(self, on_progress: Optional[ProgressCallback], profile_url: str, posts_scraped: int) -> None:
+        if not on_progress:
+            return
+        try:
+            await on_progress(profile_url, posts_scraped)
+        except Exception as e:
+            print(f"Scrape progress callback failed for {self._username_from_url(profile_url)}: {e}")
 
-            try:
-                run_response = await self.http_client.post(
-                    apify_url,
-                    headers={"Content-Type": "application/json"},
-                    json=input_body,
-                    timeout=httpx.Timeout(120.0) # Increased timeout for scraping
+    async def _scrape_pipelined(
+        self,
+        profile_urls: List[str],
+        user_id: Optional[str],
+        on_progress: Optional[ProgressCallback],
+        refresh_stats: bool
+    ) -> ScrapeResult:
+        """
+        Producer/consumer ingest: one producer per profile runs the actor and pushes each dataset
+        page onto a bounded queue, while a single consumer saves pages as they arrive. Fetching and
+        persisting overlap, and at most APIFY_PIPELINE_QUEUE_SIZE pages are held in memory.
+        """
+        queue: "asyncio.Queue[Optional[PipelineItem]]" = asyncio.Queue(maxsize=APIFY_PIPELINE_QUEUE_SIZE)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        totals = {"scraped": 0, "new": 0, "refreshed": 0}
+        sample_posts: List[ApiMaestroPost] = []
+        # Every page is checked against the marks as they were before this run stored anything,
+        # otherwise a page's newest post would hide the older posts on the pages after it
+        marks_snapshot: Dict[str, CreatorProfile] = {}
+        pending_marks: Dict[str, Dict[int, Dict[str, Any]]] = {url: {} for url in profile_urls}
+
+        async def produce(profile_url: str) -> None:
+            async with semaphore:
+                posts_scraped, complete = await self._stream_profile_posts(profile_url, queue)
+            if complete:
+                # Queued behind the profile's last page, so its marks advance once all pages are stored
+                await queue.put((profile_url, None))
+            await self._report_progress(on_progress, profile_url, posts_scraped)
+
+        async def consume() -> None:
+            while (item := await queue.get()) is not None:
+                profile_url, posts = item
+                if posts is None:
+                    await self._write_high_water_marks(pending_marks.pop(profile_url, {}))
+                    continue
+                new_posts, stats_refreshed = await self._save_posts_and_auto_follow(
+                    posts, user_id, refresh_stats, marks_snapshot=marks_snapshot, pending_marks=pending_marks[profile_url]
                 )
-                run_response.raise_for_status() # Raise an exception for bad status codes
+                totals["scraped"] += len(posts)
+                totals["new"] += new_posts
+                totals["refreshed"] += stats_refreshed
+                sample_posts.extend(posts[:5 - len(sample_posts)])
+
+        consumer = asyncio.create_task(consume())
+        producers = {asyncio.create_task(produce(url)): url for url in profile_urls}
+        fetching = asyncio.ensure_future(asyncio.wait(producers.keys(), timeout=self.run_deadline))
+        await asyncio.wait([fetching, consumer], return_when=asyncio.FIRST_COMPLETED)
+
+        if consumer.done():
+            # The consumer only stops early when a save failed; stop fetching and surface the error
+            fetching.cancel()
+            for task in producers:
+                task.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+            consumer.result()
+
+        _, pending = fetching.result()
+        for task in pending:
+            task.cancel()
+            print(f"Apify fetch for {self._username_from_url(producers[task])} cancelled: exceeded run deadline of {self.run_deadline}s")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        await queue.put(None)
+        await consumer
+
+        if not totals["scraped"]:
+            return ScrapeResult(
+                success=False,
+                postsScraped=0,
+                error="No posts found for any profile",
+                urlsSent=profile_urls,
+            )
+
+        return ScrapeResult(
+            success=True,
+            postsScraped=totals["scraped"],
+            newPosts=totals["new"],
+            statsRefreshed=totals["refreshed"] if refresh_stats else None,
+            posts=sample_posts,  # Return first 5 for debugging
+        )
 
-                response_text = run_response.text
+    async def _stream_profile_posts(self, profile_url: str, queue: "asyncio.Queue[Optional[PipelineItem]]") -> Tuple[int, bool]:
+        """
+        Starts an actor run for the profile and forwards its dataset page by page while the run
+        progresses. Returns the number of posts queued and whether the run succeeded and its
+        whole dataset was read.
+        """
+        username = self._username_from_url(profile_url)
+        posts_scraped = 0
+        complete = False
+        run_id: Optional[str] = None
 
-                if not response_text.strip():
-                    print(f"Empty response for {username}")
+        try:
+            # Starting a run twice would bill twice, so a timed-out start is not retried
+            run_response = await self.apify.post(
+                f"/v2/acts/{APIFY_ACTOR_ID}/runs",
+                json={"username": username},
+                timeout=30.0,
+                idempotent=False,
+            )
+            run_response.raise_for_status()
+            run = run_response.json()["data"]
+            run_id, dataset_id, run_status = run["id"], run["defaultDatasetId"], run["status"]
+
+            offset = 0
+            while True:
+                page_response = await self.apify.get(
+                    f"/v2/datasets/{dataset_id}/items",
+                    params={"format": "json", "clean": "true", "offset": offset, "limit": APIFY_DATASET_PAGE_SIZE},
+                    timeout=30.0,
+                )
+                page_response.raise_for_status()
+                items = page_response.json()
+
+                if items:
+                    offset += len(items)
+                    posts = self._extract_posts_from_items(items)
+                    if posts:
+                        await queue.put((profile_url, posts))
+                        posts_scraped += len(posts)
                     continue
 
-                results = json.loads(response_text)
-                posts = self._extract_posts_from_response(results)
-                all_posts.extend(posts)
+                # No new items: done if the run has finished, otherwise long-poll its status
+                if run_status in APIFY_TERMINAL_RUN_STATUSES:
+                    break
+                status_response = await self.apify.get(
+                    f"/v2/actor-runs/{run_id}",
+                    params={"waitForFinish": APIFY_RUN_POLL_SECONDS},
+                    timeout=APIFY_RUN_POLL_SECONDS + 30.0,
+                )
+                status_response.raise_for_status()
+                run_status = status_response.json()["data"]["status"]
+
+            if run_status != "SUCCEEDED":
+                print(f"Apify run for {username} ended with status {run_status}")
+            complete = run_status == "SUCCEEDED"
+            run_id = None
+
+        except asyncio.CancelledError:
+            raise
+        except ApifyUnavailable as e:
+            print(f"Skipped Apify fetch for {username}: {e}")
+        except httpx.HTTPStatusError as e:
+            print(f"Apify HTTP error for {username}: {e.response.status_code} - {e.response.text[:500]}")
+        except httpx.RequestError as e:
+            print(f"Apify request error for {username}: {e}")
+        except (KeyError, ValueError) as e:
+            print(f"Invalid Apify response for {username}: {e}")
+        except Exception as e:
+            print(f"Unexpected error fetching posts for {username}: {e}")
+        finally:
+            if run_id is not None:
+                # Abandoned (deadline, error or cancellation): stop the run so it stops billing
+                asyncio.ensure_future(self._abort_run(run_id))
 
-            except httpx.HTTPStatusError as e:
-                print(f"Apify HTTP error for {username}: {e.response.status_code} - {e.response.text[:500]}")
-            except httpx.RequestError as e:
-                print(f"Apify request error for {username}: {e}")
-            except json.JSONDecodeError as e:
-                print(f"Invalid JSON response for {username}: {e}")
-            except Exception as e:
-                print(f"Unexpected error fetching posts for {username}: {e}")
+        return posts_scraped, complete
 
-        return all_posts
+    async def _abort_run(self, run_id: str) -> None:
+        try:
+            await self.apify.post(f"/v2/actor-runs/{run_id}/abort", timeout=10.0)
+        except Exception as e:
+            print(f"Failed to abort Apify run {run_id}: {e}")
+
+    def _extract_posts_from_items(self, items: List[Any]) -> List[ApiMaestroPost]:
+        # A dataset item is either one post or a wrapped { success, data: { posts } } batch
+        posts: List[ApiMaestroPost] = []
+        for item in items:
+            posts.extend(self._extract_posts_from_response([item]))
+        return posts
+
+    def _username_from_url(self, profile_url: str) -> str:
+        url_match = re.search(r"linkedin\.com/in/([^\/\?]+)", profile_url)
+        return url_match.group(1) if url_match else profile_url
+
+    async def _fetch_profile_posts(self, profile_url: str) -> List[ApiMaestroPost]:
+        username = self._username_from_url(profile_url)
+
+        input_body = {"username": username}
+
+        try:
+            # A repeated synchronous run returns the same dataset, so it is safe to retry
+            run_response = await self.apify.post(
+                f"/v2/acts/{APIFY_ACTOR_ID}/run-sync-get-dataset-items",
+                json=input_body,
+                timeout=120.0 # Increased timeout for scraping
+            )
+            run_response.raise_for_status() # Raise an exception for bad status codes
+
+            response_text = run_response.text
+
+            if not response_text.strip():
+                print(f"Empty response for {username}")
+                return []
+
+            results = json.loads(response_text)
+            return self._extract_posts_from_response(results)
+
+        except ApifyUnavailable as e:
+            print(f"Skipped Apify fetch for {username}: {e}")
+        except httpx.HTTPStatusError as e:
+            print(f"Apify HTTP error for {username}: {e.response.status_code} - {e.response.text[:500]}")
+        except httpx.RequestError as e:
+            print(f"Apify request error for {username}: {e}")
+        except json.JSONDecodeError as e:
+            print(f"Invalid JSON response for {username}: {e}")
+        except Exception as e:
+            print(f"Unexpected error fetching posts for {username}: {e}")
+
+        return []
 
     def _extract_posts_from_response(self, results: Any) -> List[ApiMaestroPost]:
         # Handle wrapped response format: [{ success, data: { posts } }]
@@ -105,64 +360,201 @@ class LinkedInScraperService:
             print(f"Unexpected Apify response format: {results}")
             return []
 
-    async def _save_posts_and_auto_follow(self, posts: List[ApiMaestroPost], user_id: str) -> None:
-        creator_ids = set()
-
-        for post in posts:
-            creator_id = await self._find_or_create_creator(post)
-            if creator_id is None:
-                continue
+    async def _save_posts_and_auto_follow(
+        self,
+        posts: List[ApiMaestroPost],
+        user_id: Optional[str],
+        refresh_stats: bool = False,
+        marks_snapshot: Optional[Dict[str, CreatorProfile]] = None,
+        pending_marks: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> Tuple[int, int]:
+        """
+        Returns (posts saved, posts whose stats were refreshed).
+
+        A run that saves several batches of the same creators passes `marks_snapshot`, so every
+        batch is compared against the creators' marks as they were when the run first saw them,
+        and `pending_marks`, which collects the new marks instead of writing them.
+        """
+        # Resolve creators and dedupe posts set-wise: a constant number of round trips per batch
+        posts_with_profile_urls = [(post, self._clean_profile_url(post)) for post in posts]
+
+        creators_by_url = await self._find_or_create_creators(posts_with_profile_urls)
+        if marks_snapshot is not None:
+            creators_by_url = {url: marks_snapshot.setdefault(url, creator) for url, creator in creators_by_url.items()}
+
+        # Posts at or below the creator's high-water mark are already stored, skip them without a lookup
+        unseen: List[Tuple[ApiMaestroPost, str]] = []
+        seen: List[Tuple[ApiMaestroPost, str]] = []
+        for post, profile_url in posts_with_profile_urls:
+            creator = creators_by_url.get(profile_url)
+            if creator and self._is_at_or_below_mark(post, creator):
+                seen.append((post, profile_url))
+            else:
+                unseen.append((post, profile_url))
+
+        new_posts = await self._save_new_posts(unseen, creators_by_url)
+        stats_refreshed = await self._refresh_changed_stats(seen, creators_by_url) if refresh_stats else 0
+        if pending_marks is not None:
+            self._collect_high_water_marks(unseen, creators_by_url, pending_marks)
+        else:
+            await self._advance_high_water_marks(unseen, creators_by_url)
 
-            creator_ids.add(creator_id)
-            await self._save_post_if_new(post, creator_id)
+        if user_id is not None:
+            await self._auto_follow_creators(list({creator.creator_id for creator in creators_by_url.values()}), user_id)
+        return new_posts, stats_refreshed
 
-        await self._auto_follow_creators(list(creator_ids), user_id)
+    def _is_at_or_below_mark(self, post: ApiMaestroPost, creator: CreatorProfile) -> bool:
+        if creator.last_post_urn and post.urn == creator.last_post_urn:
+            return True
+        posted_at = post.posted_at.timestamp if post.posted_at else None
+        # Posts from the mark's exact millisecond still go through the post_url check
+        return posted_at is not None and creator.last_posted_at_timestamp is not None and posted_at < creator.last_posted_at_timestamp
 
-    async def _find_or_create_creator(self, post: ApiMaestroPost) -> Optional[int]:
-        raw_profile_url = post.author.profile_url if post.author else ""
+    def _clean_profile_url(self, post: ApiMaestroPost) -> str:
+        raw_profile_url = post.author.profile_url if post.author and post.author.profile_url else ""
         author_profile_url = raw_profile_url.split("?")[0].rstrip('/')
-        author_name = f"{post.author.first_name or ''} {post.author.last_name or ''}".strip() if post.author else ""
         author_username = post.author.username if post.author else None
 
-        clean_profile_url = (author_username
+        return (author_username
             and f"https://www.linkedin.com/in/{author_username}"
             or author_profile_url)
 
-        if not clean_profile_url:
-            return None
-
-        existing_creator = await self.creator_repo.find_by_profile_url(clean_profile_url)
+    async def _find_or_create_creators(self, posts_with_profile_urls: List[Tuple[ApiMaestroPost, str]]) -> Dict[str, CreatorProfile]:
+        new_creators: Dict[str, Dict[str, Any]] = {}
+        for post, profile_url in posts_with_profile_urls:
+            if not profile_url or profile_url in new_creators:
+                continue
+            author_name = f"{post.author.first_name or ''} {post.author.last_name or ''}".strip() if post.author else ""
+            new_creators[profile_url] = {
+                "profile_url": profile_url,
+                "display_name": author_name,
+                "platform": "linkedin",
+            }
 
-        if existing_creator:
-            return existing_creator.creator_id
+        if not new_creators:
+            return {}
 
         try:
-            new_creator = await self.creator_repo.create(
-                profile_url=clean_profile_url,
-                display_name=author_name,
-                platform="linkedin",
-            )
-            return new_creator.creator_id
-        except Exception as e:
-            print(f"Failed to create creator: {e}, profile_url: {clean_profile_url}, display_name: {author_name}")
-            return None
+            existing_creators = await self.creator_repo.find_by_profile_urls(list(new_creators))
+            creators_by_url = {creator.profile_url: creator for creator in existing_creators}
 
-    async def _save_post_if_new(self, post: ApiMaestroPost, creator_id: int) -> None:
-        post_url = post.url
-        if not post_url:
-            return
+            missing = [row for url, row in new_creators.items() if url not in creators_by_url]
+            if missing:
+                created = await self.creator_repo.create_many(missing)
+                creators_by_url.update({creator.profile_url: creator for creator in created})
 
-        existing_post = await self.content_repo.find_by_post_url(post_url)
+                # Creators inserted by a concurrent scrape are skipped by the upsert, look them up again
+                unresolved = [row["profile_url"] for row in missing if row["profile_url"] not in creators_by_url]
+                if unresolved:
+                    raced = await self.creator_repo.find_by_profile_urls(unresolved)
+                    creators_by_url.update({creator.profile_url: creator for creator in raced})
 
-        if not existing_post:
-            await self.content_repo.create(creator_id, post_url, post.model_dump_json()) # Save as JSON string
+            return creators_by_url
+        except Exception as e:
+            print(f"Failed to find or create creators: {e}, profile_urls: {list(new_creators)}")
+            return {}
+
+    async def _save_new_posts(self, posts_with_profile_urls: List[Tuple[ApiMaestroPost, str]], creators_by_url: Dict[str, CreatorProfile]) -> int:
+        rows_by_post_url: Dict[str, Dict[str, Any]] = {}
+        for post, profile_url in posts_with_profile_urls:
+            creator = creators_by_url.get(profile_url)
+            if not post.url or creator is None or post.url in rows_by_post_url:
+                continue
+            rows_by_post_url[post.url] = {
+                "creator_id": creator.creator_id,
+                "post_url": post.url,
+                "post_raw": post.model_dump_json(), # Save as JSON string
+                # Parse once at ingest; the feed serves these columns instead of re-parsing post_raw
+                **projection_columns(project_post_data(post.model_dump())),
+            }
+
+        if not rows_by_post_url:
+            return 0
+
+        # Posts the known-URL set has seen are stored for sure, only the rest need a lookup
+        known_post_urls, unknown_post_urls = self.known_post_urls.partition(rows_by_post_url) if self.known_post_urls is not None else (set(), list(rows_by_post_url))
+        existing_post_urls = await self.content_repo.find_existing_post_urls(unknown_post_urls) if unknown_post_urls else set()
+        new_rows = [row for post_url, row in rows_by_post_url.items() if post_url not in known_post_urls and post_url not in existing_post_urls]
+
+        if new_rows:
+            if self.near_duplicates is not None:
+                if self.near_duplicates.needs_load():
+                    asyncio.ensure_future(self.near_duplicates.load())
+                # CPU-bound for large batches, keep it off the event loop
+                duplicates = await asyncio.to_thread(self.near_duplicates.annotate, new_rows)
+                if duplicates:
+                    print(f"Flagged {duplicates} of {len(new_rows)} new posts as near-duplicates")
+            await self.content_repo.create_many(new_rows)
+        if self.known_post_urls is not None:
+            self.known_post_urls.add(unknown_post_urls)
+        return len(new_rows)
+
+    async def _refresh_changed_stats(self, posts_with_profile_urls: List[Tuple[ApiMaestroPost, str]], creators_by_url: Dict[str, CreatorProfile]) -> int:
+        scraped = {post.url: post for post, _ in posts_with_profile_urls if post.url}
+        if not scraped:
+            return 0
+
+        stored = await self.content_repo.find_stats_by_post_urls(list(scraped))
+        updates = []
+        for post_url, row in stored.items():
+            post = scraped[post_url]
+            post_stats = projection_columns(project_post_data(post.model_dump()))["post_stats"]
+            if post_stats == row.get("post_stats"):
+                continue
+            # The creator_content_stats trigger applies the engagement delta to creator_stats
+            updates.append({
+                "content_id": row["content_id"],
+                "creator_id": row["creator_id"],
+                "post_url": post_url,
+                "post_raw": post.model_dump_json(),
+                "post_stats": post_stats,
+            })
+
+        if updates:
+            await self.content_repo.update_stats(updates)
+        return len(updates)
+
+    async def _advance_high_water_marks(self, posts_with_profile_urls: List[Tuple[ApiMaestroPost, str]], creators_by_url: Dict[str, CreatorProfile]) -> None:
+        # Called once the posts are stored; the newest post of each creator becomes its mark
+        marks: Dict[int, Dict[str, Any]] = {}
+        self._collect_high_water_marks(posts_with_profile_urls, creators_by_url, marks)
+        await self._write_high_water_marks(marks)
+
+    def _collect_high_water_marks(
+        self,
+        posts_with_profile_urls: List[Tuple[ApiMaestroPost, str]],
+        creators_by_url: Dict[str, CreatorProfile],
+        marks: Dict[int, Dict[str, Any]]
+    ) -> None:
+        for post, profile_url in posts_with_profile_urls:
+            creator = creators_by_url.get(profile_url)
+            posted_at = post.posted_at.timestamp if post.posted_at else None
+            if creator is None or not post.url or posted_at is None:
+                continue
+            if creator.last_posted_at_timestamp is not None and posted_at <= creator.last_posted_at_timestamp:
+                continue
+            mark = marks.get(creator.creator_id)
+            if mark is None or posted_at > mark["last_posted_at_timestamp"]:
+                marks[creator.creator_id] = {
+                    "creator_id": creator.creator_id,
+                    "last_post_urn": post.urn,
+                    "last_posted_at_timestamp": posted_at,
+                }
+
+    async def _write_high_water_marks(self, marks: Dict[int, Dict[str, Any]]) -> None:
+        if not marks:
+            return
+        try:
+            await self.creator_repo.advance_high_water_marks(list(marks.values()))
+        except Exception as e:
+            # Without a new mark the next scrape just re-checks these posts by post_url
+            print(f"Failed to advance high-water marks: {e}, creatorIds: {list(marks)}")
 
     async def _auto_follow_creators(self, creator_ids: List[int], user_id: str) -> None:
-        for creator_id in creator_ids:
-            try:
-                await self.user_follow_repo.upsert(user_id, creator_id)
-            except Exception as e:
-                print(f"Failed to auto-follow creator: {e}, userId: {user_id}, creatorId: {creator_id}")
+        try:
+            await self.user_follow_repo.upsert_many(user_id, creator_ids)
+        except Exception as e:
+            print(f"Failed to auto-follow creators: {e}, userId: {user_id}, creatorIds: {creator_ids}")
 
 # Singleton instance with injected repositories
 apify_token = os.getenv("APIFY_API_TOKEN")
@@ -180,5 +572,7 @@ linked_in_scraper_service = LinkedInScraperService(
     apify_token=apify_token,
     creator_repo=_creator_repository,
     content_repo=_content_repository,
-    user_follow_repo=_user_follow_repository
+    user_follow_repo=_user_follow_repository,
+    known_post_urls=KnownPostUrls(_content_repository.iter_post_urls),
+    near_duplicates=NearDuplicateIndex(_content_repository.iter_recent_texts)
 )
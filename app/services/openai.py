@@ -1,36 +1,203 @@
+import asyncio
+import hashlib
 import os
 import json
-from typing import Dict, Any, List, Optional, Literal
+import tempfile
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, List, Optional, Literal, Tuple, TypeVar
+import httpx
 import openai
-from openai import OpenAI
-from app.models import Question, AnalysisResult, ConversationMessage, AskQuestionResponse, GenerateEditResponse
+from openai import AsyncOpenAI
+from app.cache import DiskLRUCache, ResponseCache
+from app.diff import word_diff
+from app.models import Question, AnalysisResult, ConversationMessage, AskQuestionResponse, GenerateEditResponse, PromptUsage
+from app.prompt_budget import fit_prompt
+from app.rate_limit import upstream_rate_limit_error
+
+T = TypeVar("T")
+
+# Shared HTTP pool for all OpenAI calls made by this worker
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", "20"))
+OPENAI_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY_SECONDS", "30"))
+OPENAI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("OPENAI_CONNECT_TIMEOUT_SECONDS", "5"))
+OPENAI_TIMEOUT_SECONDS = float(os.getenv("OPENAI_TIMEOUT_SECONDS", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# Cap on in-flight upstream calls per endpoint, e.g. OPENAI_MAX_CONCURRENCY_GENERATE_EDIT=4
+OPENAI_DEFAULT_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_ENDPOINTS = ["generate_speech", "ask_question", "generate_edit", "analyze_post", "extract_field_value"]
+
+# Response cache for deterministic-enough calls (analyze_post, extract_field_value).
+# The disk tier is enabled by pointing OPENAI_CACHE_DB_PATH at a SQLite file.
+OPENAI_CACHE_TTL_SECONDS = float(os.getenv("OPENAI_CACHE_TTL_SECONDS", "86400"))
+OPENAI_CACHE_MAX_ENTRIES = int(os.getenv("OPENAI_CACHE_MAX_ENTRIES", "1024"))
+OPENAI_CACHE_DB_PATH = os.getenv("OPENAI_CACHE_DB_PATH")
+OPENAI_CACHE_DISK_MAX_ENTRIES = int(os.getenv("OPENAI_CACHE_DISK_MAX_ENTRIES", "100000"))
+
+# Disk cache of rendered speech; set TTS_CACHE_DIR to an empty string to disable it
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "hermes-tts-cache"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+TTS_CHUNK_SIZE = 16 * 1024
+
+def _endpoint_concurrency(endpoint: str) -> int:
+    return int(os.getenv(f"OPENAI_MAX_CONCURRENCY_{endpoint.upper()}", str(OPENAI_DEFAULT_MAX_CONCURRENCY)))
+
+def completion_fingerprint(endpoint: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    """
+    Content address of a completion request: a hash of the rendered prompt and model parameters.
+    """
+    payload = json.dumps({"endpoint": endpoint, "messages": messages, "params": params}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _is_json(content: str) -> bool:
+    try:
+        json.loads(content)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key: the first caller starts the work as a task and
+    later callers await the same task. Each caller awaits through asyncio.shield, so a caller
+    being cancelled (e.g. a client disconnecting) never cancels the call the others are waiting on.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, "asyncio.Task[Any]"] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every waiter went away before it finished
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"inFlight": len(self._in_flight), "started": self.started, "coalesced": self.coalesced}
 
 class OpenAIService:
     def __init__(self):
         api_key = os.getenv("OPEN_AI_API_KEY")
         if not api_key:
             raise ValueError("OPEN_AI_API_KEY environment variable is not set.")
-        self.openai_client = OpenAI(api_key=api_key)
 
-    async def generate_speech(
+        timeout = httpx.Timeout(OPENAI_TIMEOUT_SECONDS, connect=OPENAI_CONNECT_TIMEOUT_SECONDS)
+        self.http_client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        self.openai_client = AsyncOpenAI(
+            api_key=api_key,
+            http_client=self.http_client,
+            timeout=timeout,
+            max_retries=OPENAI_MAX_RETRIES,
+        )
+        # One semaphore per endpoint so a burst on one AI route can't starve the others
+        self.concurrency_limits: Dict[str, asyncio.Semaphore] = {
+            endpoint: asyncio.Semaphore(_endpoint_concurrency(endpoint)) for endpoint in OPENAI_ENDPOINTS
+        }
+        self.in_flight = SingleFlight()
+        self.audio_cache = DiskLRUCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES, suffix=".mp3") if TTS_CACHE_DIR else None
+        self.response_cache = ResponseCache(
+            max_entries=OPENAI_CACHE_MAX_ENTRIES,
+            ttl=OPENAI_CACHE_TTL_SECONDS,
+            disk_path=OPENAI_CACHE_DB_PATH,
+            disk_max_entries=OPENAI_CACHE_DISK_MAX_ENTRIES,
+        )
+
+    async def stream_speech(
         self,
         text: str,
         voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "alloy"
-    ) -> bytes: # Return type changed to bytes for audio data
-        mp3 = await self.openai_client.audio.speech.create(
-            model="tts-1",
-            voice=voice,
-            input=text,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yields MP3 chunks as the provider synthesizes them. Rendered audio is kept in a disk
+        cache keyed by (text, voice), so repeated prompts are served from local files.
+        """
+        key = hashlib.sha256(json.dumps(["tts-1", voice, text]).encode()).hexdigest()
+
+        cached_file = await asyncio.to_thread(self.audio_cache.reader, key) if self.audio_cache else None
+        if cached_file is not None:
+            try:
+                while chunk := await asyncio.to_thread(cached_file.read, TTS_CHUNK_SIZE):
+                    yield chunk
+            finally:
+                cached_file.close()
+            return
+
+        try:
+            async with self.concurrency_limits["generate_speech"]:
+                async with self.openai_client.audio.speech.with_streaming_response.create(
+                    model="tts-1",
+                    voice=voice,
+                    input=text,
+                    response_format="mp3",
+                ) as response:
+                    if not self.audio_cache:
+                        async for chunk in response.iter_bytes(TTS_CHUNK_SIZE):
+                            yield chunk
+                        return
+
+                    # The cache entry is only committed if the whole stream was received
+                    async with self.audio_cache.writer(key) as cache_file:
+                        async for chunk in response.iter_bytes(TTS_CHUNK_SIZE):
+                            await asyncio.to_thread(cache_file.write, chunk)
+                            yield chunk
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
+
+    def _log_prompt_usage(self, endpoint: str, usage: PromptUsage) -> None:
+        print(
+            f"[{endpoint}] prompt tokens: {usage.promptTokens}/{usage.budget}"
+            f" (summarized messages: {usage.summarizedMessages}, dropped context: {len(usage.droppedContextFields)},"
+            f" body truncated: {usage.bodyTruncated})"
         )
-        return mp3.read() # Read as bytes
 
-    async def ask_question(
+    def _build_ask_question_messages(
         self,
         post_content: str,
         conversation_history: List[ConversationMessage],
         existing_context: Optional[Dict[str, str]] = None,
         missing_fields: Optional[List[str]] = None
-    ) -> AskQuestionResponse:
+    ) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        # Tokenizing a long prompt is CPU-bound, callers run this in a worker thread
+        # The post may be truncated as a last resort; the questions only need its gist
+        messages, usage = fit_prompt(
+            lambda body, context, history: self._render_ask_question_messages(body, history, context, missing_fields),
+            body=post_content,
+            context=existing_context,
+            history=conversation_history,
+            truncate_body=True,
+        )
+        self._log_prompt_usage("ask_question", usage)
+        return messages, usage
+
+    def _render_ask_question_messages(
+        self,
+        post_content: str,
+        conversation_history: List[ConversationMessage],
+        existing_context: Optional[Dict[str, str]] = None,
+        missing_fields: Optional[List[str]] = None
+    ) -> List[Dict[str, str]]:
         # Build context section from existing profile data
         existing_data_section = ""
         if existing_context and len(existing_context) > 0:
@@ -73,28 +240,46 @@ Current conversation length: {len(conversation_history)} messages
 
 {('If we have sufficient profile data for this post, respond with ONLY "READY_TO_GENERATE". Otherwise, ask your first question about critical missing context.' if len(conversation_history) == 0 else 'Ask your next question about critical missing info, or respond with ONLY "READY_TO_GENERATE" if you have enough context.')}"""
 
-        messages_for_openai = [
+        return [
             {"role": "system", "content": system_prompt},
             *([{"role": msg.role, "content": msg.content} for msg in conversation_history])
         ]
 
-        try:
-            completion = await self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages_for_openai,
-                temperature=0.7,
-            )
 
-            response_content = completion.choices[0].message.content.strip()
-            if not response_content:
-                raise ValueError("OpenAI API returned an empty response.")
+    def _parse_ask_question_response(self, response_content: str) -> AskQuestionResponse:
+        response_content = response_content.strip()
+        if not response_content:
+            raise ValueError("OpenAI API returned an empty response.")
 
-            # Check if response contains READY_TO_GENERATE (be lenient with AI being chatty)
-            if "READY_TO_GENERATE" in response_content:
-                return AskQuestionResponse(ready=True)
-            else:
-                return AskQuestionResponse(ready=False, question=response_content)
+        # Check if response contains READY_TO_GENERATE (be lenient with AI being chatty)
+        if "READY_TO_GENERATE" in response_content:
+            return AskQuestionResponse(ready=True)
+        else:
+            return AskQuestionResponse(ready=False, question=response_content)
 
+    async def ask_question(
+        self,
+        post_content: str,
+        conversation_history: List[ConversationMessage],
+        existing_context: Optional[Dict[str, str]] = None,
+        missing_fields: Optional[List[str]] = None
+    ) -> AskQuestionResponse:
+        messages_for_openai, usage = await asyncio.to_thread(self._build_ask_question_messages, post_content, conversation_history, existing_context, missing_fields)
+
+        try:
+            async with self.concurrency_limits["ask_question"]:
+                completion = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=messages_for_openai,
+                    temperature=0.7,
+                )
+
+            response = self._parse_ask_question_response(completion.choices[0].message.content or "")
+            response.usage = usage
+            return response
+
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
         except openai.APIError as e:
             print(f"OpenAI API Error: {e}")
             raise ValueError(f"OpenAI API error: {e.code} - {e.message}") from e
@@ -102,14 +287,58 @@ Current conversation length: {len(conversation_history)} messages
             print(f"Unexpected error in ask_question: {e}")
             raise
 
-    async def generate_edit(
+    async def stream_ask_question(
+        self,
+        post_content: str,
+        conversation_history: List[ConversationMessage],
+        existing_context: Optional[Dict[str, str]] = None,
+        missing_fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of ask_question. Yields ("token", delta) while the completion is generated,
+        then a single ("done", AskQuestionResponse).
+        """
+        messages_for_openai, usage = await asyncio.to_thread(self._build_ask_question_messages, post_content, conversation_history, existing_context, missing_fields)
+
+        response_content = ""
+        # Closed as soon as this generator is, so an abandoned stream is released right away
+        async with aclosing(self._stream_completion("ask_question", messages_for_openai, temperature=0.7)) as deltas:
+            async for delta in deltas:
+                response_content += delta
+                yield "token", delta
+
+        response = self._parse_ask_question_response(response_content)
+        response.usage = usage
+        yield "done", response
+
+    def _build_generate_edit_messages(
         self,
         text: str,
         prompt: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
         conversation_history: Optional[List[ConversationMessage]] = None,
         similarity: Optional[int] = None # 0-100
-    ) -> GenerateEditResponse:
+    ) -> Tuple[List[Dict[str, str]], PromptUsage]:
+        # Also CPU-bound on long texts, callers run this in a worker thread
+        # The text being edited is always sent whole, only history and context are compacted
+        messages, usage = fit_prompt(
+            lambda body, ctx, history: self._render_generate_edit_messages(body, prompt, ctx, history, similarity),
+            body=text,
+            context=context,
+            history=conversation_history or [],
+            truncate_body=False,
+        )
+        self._log_prompt_usage("generate_edit", usage)
+        return messages, usage
+
+    def _render_generate_edit_messages(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        conversation_history: Optional[List[ConversationMessage]] = None,
+        similarity: Optional[int] = None # 0-100
+    ) -> List[Dict[str, str]]:
         context_section = ""
         if context and len(context) > 0:
             parts = []
@@ -188,29 +417,44 @@ IMPORTANT RULES:
         if conversation_history:
             messages_for_openai.extend([{"role": msg.role, "content": msg.content} for msg in conversation_history])
 
-        try:
-            completion = await self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=messages_for_openai,
-                temperature=0.7,
-            )
+        return messages_for_openai
 
-            suggested_text = completion.choices[0].message.content or ""
+    def _build_generate_edit_response(self, text: str, suggested_text: str, usage: Optional[PromptUsage] = None) -> GenerateEditResponse:
+        # Word-level diff; CPU-bound on long posts, callers run this off the event loop
+        additions, deletions, changes = word_diff(text, suggested_text)
 
-            # Calculate actual additions/deletions by comparing words
-            original_words = set(text.lower().split())
-            suggested_words = set(suggested_text.lower().split())
+        return GenerateEditResponse(
+            originalText=text,
+            suggestedText=suggested_text,
+            additions=additions,
+            deletions=deletions,
+            changes=changes,
+            usage=usage,
+        )
 
-            additions = len(suggested_words - original_words)
-            deletions = len(original_words - suggested_words)
+    async def generate_edit(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        conversation_history: Optional[List[ConversationMessage]] = None,
+        similarity: Optional[int] = None # 0-100
+    ) -> GenerateEditResponse:
+        messages_for_openai, usage = await asyncio.to_thread(self._build_generate_edit_messages, text, prompt, context, conversation_history, similarity)
 
-            return GenerateEditResponse(
-                originalText=text,
-                suggestedText=suggested_text,
-                additions=additions,
-                deletions=deletions,
+        try:
+            # Sampled at temperature 0.7, so not cached, but identical concurrent requests are coalesced
+            suggested_text = await self._completion(
+                "generate_edit",
+                messages_for_openai,
+                use_cache=False,
+                model="gpt-4o-mini",
+                temperature=0.7,
             )
+            return await asyncio.to_thread(self._build_generate_edit_response, text, suggested_text, usage)
 
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
         except openai.APIError as e:
             print(f"OpenAI API Error: {e}")
             raise ValueError(f"OpenAI API error: {e.code} - {e.message}") from e
@@ -218,6 +462,83 @@ IMPORTANT RULES:
             print(f"Unexpected error in generate_edit: {e}")
             raise
 
+    async def stream_generate_edit(
+        self,
+        text: str,
+        prompt: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        conversation_history: Optional[List[ConversationMessage]] = None,
+        similarity: Optional[int] = None # 0-100
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of generate_edit. Yields ("token", delta) while the edit is generated,
+        then a single ("done", GenerateEditResponse) carrying the additions/deletions.
+        """
+        messages_for_openai, usage = await asyncio.to_thread(self._build_generate_edit_messages, text, prompt, context, conversation_history, similarity)
+
+        suggested_text = ""
+        async with aclosing(self._stream_completion("generate_edit", messages_for_openai, temperature=0.7)) as deltas:
+            async for delta in deltas:
+                suggested_text += delta
+                yield "token", delta
+
+        yield "done", await asyncio.to_thread(self._build_generate_edit_response, text, suggested_text, usage)
+
+    async def _completion(
+        self,
+        endpoint: str,
+        messages: List[Dict[str, str]],
+        use_cache: bool = True,
+        cache_if: Callable[[str], bool] = bool,
+        **params: Any
+    ) -> str:
+        """
+        Runs a chat completion keyed by its fingerprint, a hash of the fully rendered messages and
+        every model parameter. Identical concurrent requests share one upstream call; when
+        `use_cache` is set, responses accepted by `cache_if` are also kept in the response cache.
+        """
+        key = completion_fingerprint(endpoint, messages, params)
+        if use_cache:
+            cached = await self.response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        async def call_upstream() -> str:
+            async with self.concurrency_limits[endpoint]:
+                completion = await self.openai_client.chat.completions.create(messages=messages, **params)
+
+            response_content = completion.choices[0].message.content or ""
+            if use_cache and cache_if(response_content):
+                await self.response_cache.set(key, response_content)
+            return response_content
+
+        return await self.in_flight.run(key, call_upstream)
+
+    async def _stream_completion(self, endpoint: str, messages: List[Dict[str, str]], temperature: float) -> AsyncIterator[str]:
+        # Holds the endpoint's concurrency slot for the whole stream, like the non-streaming calls
+        try:
+            async with self.concurrency_limits[endpoint]:
+                stream = await self.openai_client.chat.completions.create(
+                    model="gpt-4o-mini",
+                    messages=messages,
+                    temperature=temperature,
+                    stream=True,
+                )
+                try:
+                    async for chunk in stream:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+                finally:
+                    # A client that disconnects abandons the stream mid-generation; closing it frees the
+                    # connection and the slot now rather than once OpenAI finishes. Shielded because
+                    # this runs while the request is being cancelled.
+                    await asyncio.shield(stream.close())
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
+        except openai.APIError as e:
+            print(f"OpenAI API Error: {e}")
+            raise ValueError(f"OpenAI API error: {e.code} - {e.message}") from e
+
     async def analyze_post(self, post_content: str, existing_profile: Optional[Dict[str, Any]] = None) -> AnalysisResult:
         profile_context = ""
         if existing_profile and len(existing_profile) > 0:
@@ -264,15 +585,16 @@ Rules:
             }
         ]
 
+        response_content = None
         try:
-            completion = await self.openai_client.chat.completions.create(
+            response_content = await self._completion(
+                "analyze_post",
+                messages,
+                cache_if=_is_json,
                 model="gpt-4o-mini",
-                messages=messages,
                 temperature=0.3,
                 response_format={"type": "json_object"}
             )
-
-            response_content = completion.choices[0].message.content
             if not response_content:
                 raise ValueError("OpenAI API returned an empty response.")
 
@@ -288,6 +610,8 @@ Rules:
             print(f"JSON Decode Error: {e}")
             print(f"Raw response: {response_content}")
             raise ValueError("Failed to parse OpenAI response as JSON.") from e
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
         except openai.APIError as e:
             print(f"OpenAI API Error: {e}")
             raise ValueError(f"OpenAI API error: {e.code} - {e.message}") from e
@@ -320,13 +644,16 @@ Return ONLY the extracted value, nothing else."""
         ]
 
         try:
-            completion = await self.openai_client.chat.completions.create(
+            response_content = await self._completion(
+                "extract_field_value",
+                messages,
                 model="gpt-4o-mini",
-                messages=messages,
                 temperature=0.3,
                 max_tokens=100,
             )
-            return completion.choices[0].message.content.strip() or transcript
+            return response_content.strip() or transcript
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
         except openai.APIError as e:
             print(f"OpenAI API Error: {e}")
             raise ValueError(f"OpenAI API error: {e.code} - {e.message}") from e
@@ -334,5 +661,70 @@ Return ONLY the extracted value, nothing else."""
             print(f"Unexpected error in extract_field_value: {e}")
             raise
 
+    async def extract_field_values(self, transcript: str, field_labels: List[str]) -> Dict[str, str]:
+        """
+        Extracts several form fields from one transcript with a single JSON-mode completion.
+        Fields the model leaves out (or a response that fails to parse) fall back to one
+        extract_field_value call per field. A field the model left empty gets the transcript,
+        as extract_field_value returns in that case.
+        """
+        labels = list(dict.fromkeys(field_labels)) # Dedupe, keep order
+        fields_list = "\n".join(f"- {label}" for label in labels)
+        messages = [
+            {
+                "role": "system",
+                "content": """You are extracting structured data from natural language voice input.
+The user is filling out a profile form using voice input and answered several fields at once.
+For each requested field, extract ONLY the relevant value from what the user said.
+Be concise - extract just the core information, not full sentences.
+
+Examples:
+Field: "Current Title" | User says: "I'm the founder" → Extract: "Founder"
+Field: "Company Name" | User says: "my company is called Acme Corp" → Extract: "Acme Corp"
+Field: "Industry" | User says: "we're in SaaS" → Extract: "SaaS"
+Field: "Location" | User says: "I'm based in San Francisco" → Extract: "San Francisco"
+Field: "Total Users" | User says: "we have about 1000 users" → Extract: "1000"
+
+Return a JSON object whose keys are exactly the requested field labels and whose values are the extracted strings.
+Use an empty string for a field the user did not mention."""
+            },
+            {
+                "role": "user",
+                "content": f"Fields:\n{fields_list}\n\nUser said: \"{transcript}\"\n\nExtract the values:"
+            }
+        ]
+
+        values: Dict[str, str] = {}
+        try:
+            response_content = await self._completion(
+                "extract_field_value",
+                messages,
+                cache_if=_is_json,
+                model="gpt-4o-mini",
+                temperature=0.3,
+                max_tokens=min(100 * len(labels), 4000),
+                response_format={"type": "json_object"}
+            )
+            parsed_response = json.loads(response_content)
+            if isinstance(parsed_response, dict):
+                values = {
+                    label: parsed_response[label].strip() or transcript
+                    for label in labels
+                    if isinstance(parsed_response.get(label), str)
+                }
+        except json.JSONDecodeError as e:
+            print(f"Batch extraction returned invalid JSON, falling back to per-field calls: {e}")
+        except openai.RateLimitError as e:
+            raise upstream_rate_limit_error(e) from e
+        except openai.APIError as e:
+            print(f"OpenAI API Error in batch extraction, falling back to per-field calls: {e}")
+
+        missing = [label for label in labels if label not in values]
+        if missing:
+            fallback_values = await asyncio.gather(*(self.extract_field_value(transcript, label) for label in missing))
+            values.update(zip(missing, fallback_values))
+
+        return {label: values[label] for label in labels}
+
 # Singleton instance
 openai_service = OpenAIService()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import asyncio
+import heapq
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from app.repositories.creator import CreatorRepository
+from app.services.linkedin_scraper import LinkedInScraperService, linked_in_scraper_service
+
+# Off by default: every process that enables it spends Apify budget, so enable it on one
+RESCRAPE_ENABLED = os.getenv("RESCRAPE_ENABLED", "false").lower() == "true"
+# One batch per tick; the batch size and tick bound the rate of actor runs
+RESCRAPE_TICK_SECONDS = float(os.getenv("RESCRAPE_TICK_SECONDS", "600"))
+RESCRAPE_BATCH_SIZE = int(os.getenv("RESCRAPE_BATCH_SIZE", "10"))
+# Actor runs (one per profile) the scheduler may start in any rolling 24 hours
+RESCRAPE_DAILY_PROFILE_BUDGET = int(os.getenv("RESCRAPE_DAILY_PROFILE_BUDGET", "200"))
+# Creators scraped more recently than this are not queued at all
+RESCRAPE_MIN_INTERVAL_HOURS = float(os.getenv("RESCRAPE_MIN_INTERVAL_HOURS", "12"))
+# Creators who posted within this window count as active and are refreshed sooner
+RESCRAPE_ACTIVE_DAYS = float(os.getenv("RESCRAPE_ACTIVE_DAYS", "14"))
+# The queue is rebuilt from the database once drained, or after this long
+RESCRAPE_QUEUE_REFRESH_SECONDS = float(os.getenv("RESCRAPE_QUEUE_REFRESH_SECONDS", "3600"))
+
+BUDGET_WINDOW_SECONDS = 24 * 3600
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def rescrape_priority(candidate: Dict[str, Any], now: datetime) -> Optional[float]:
+    """
+    Hours since the last scrape, weighted up for creators whose posts draw more engagement and
+    for creators who posted recently. None when the creator was scraped too recently to queue.
+    """
+    last_scraped_at = _parse_timestamp(candidate.get("last_scraped_at"))
+    staleness_hours = (now - last_scraped_at).total_seconds() / 3600 if last_scraped_at else float(RESCRAPE_MIN_INTERVAL_HOURS)
+    if staleness_hours < RESCRAPE_MIN_INTERVAL_HOURS:
+        return None
+
+    post_count = candidate.get("post_count") or 0
+    avg_engagement = (candidate.get("total_engagement") or 0) / post_count if post_count else 0
+    weight = 1 + math.log1p(avg_engagement)
+
+    last_posted_at = candidate.get("last_posted_at_timestamp")
+    if last_posted_at and now.timestamp() * 1000 - last_posted_at < RESCRAPE_ACTIVE_DAYS * 86_400_000:
+        weight *= 2
+
+    return staleness_hours * weight
+
+class RescrapeScheduler:
+    """
+    Periodically re-scrapes followed creators so engagement stats of their stored posts stay
+    fresh. Creators wait in a max-priority heap (see rescrape_priority); each tick pops one batch
+    and scrapes it with refresh_stats, as long as the rolling daily profile budget allows.
+    """
+
+    def __init__(
+        self,
+        creator_repo: CreatorRepository,
+        scraper: LinkedInScraperService,
+        batch_size: int = RESCRAPE_BATCH_SIZE,
+        daily_budget: int = RESCRAPE_DAILY_PROFILE_BUDGET
+    ):
+        self.creator_repo = creator_repo
+        self.scraper = scraper
+        self.batch_size = batch_size
+        self.daily_budget = daily_budget
+        self._queue: List[Tuple[float, int, str]] = [] # (-priority, creator_id, profile_url)
+        self._queue_built_at = 0.0
+        self._spent: Deque[Tuple[float, int]] = deque() # (time, profiles scraped)
+        self._task: Optional[asyncio.Task] = None
+
+    def _remaining_budget(self) -> int:
+        cutoff = time.time() - BUDGET_WINDOW_SECONDS
+        while self._spent and self._spent[0][0] < cutoff:
+            self._spent.popleft()
+        return self.daily_budget - sum(count for _, count in self._spent)
+
+    async def _rebuild_queue(self) -> None:
+        now = datetime.now(timezone.utc)
+        queue: List[Tuple[float, int, str]] = []
+        for candidate in await self.creator_repo.find_rescrape_candidates():
+            priority = rescrape_priority(candidate, now)
+            if priority is not None:
+                queue.append((-priority, candidate["creator_id"], candidate["profile_url"]))
+        heapq.heapify(queue)
+        self._queue = queue
+        self._queue_built_at = time.monotonic()
+
+    async def run_once(self) -> int:
+        """
+        Scrapes the next batch, if any is due and the budget allows. Returns the number of profiles
+        sent to Apify. Only creators whose profile returned posts are stamped as scraped.
+        """
+        batch_size = min(self.batch_size, self._remaining_budget())
+        if batch_size <= 0:
+            return 0
+
+        if not self._queue or time.monotonic() - self._queue_built_at > RESCRAPE_QUEUE_REFRESH_SECONDS:
+            await self._rebuild_queue()
+
+        batch = [heapq.heappop(self._queue) for _ in range(min(batch_size, len(self._queue)))]
+        if not batch:
+            return 0
+
+        posts_by_profile: Dict[str, int] = {}
+
+        async def on_progress(profile_url: str, posts_scraped: int) -> None:
+            posts_by_profile[profile_url] = posts_scraped
+
+        profile_urls = [profile_url for _, _, profile_url in batch]
+        try:
+            result = await self.scraper.scrape_profiles(profile_urls, None, on_progress=on_progress, refresh_stats=True)
+        finally:
+            # Actor runs are billed whether or not they found posts
+            self._spent.append((time.time(), len(batch)))
+            # Only profiles that returned posts are fresh; failed, cancelled and empty fetches go back on the queue
+            retry = [entry for entry in batch if not posts_by_profile.get(entry[2])]
+            for entry in retry:
+                heapq.heappush(self._queue, entry)
+
+        scraped = [creator_id for _, creator_id, profile_url in batch if posts_by_profile.get(profile_url)]
+        if scraped:
+            await self.creator_repo.mark_scraped(scraped, datetime.now(timezone.utc))
+        print(
+            f"Re-scraped {len(scraped)} of {len(batch)} creators: {result.newPosts or 0} new posts, "
+            f"{result.statsRefreshed or 0} stats refreshed, {self._remaining_budget()} profiles left in budget"
+        )
+        return len(batch)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Re-scrape scheduler error: {e}")
+            await asyncio.sleep(RESCRAPE_TICK_SECONDS)
+
+# Singleton instance
+rescrape_scheduler = RescrapeScheduler(linked_in_scraper_service.creator_repo, linked_in_scraper_service)
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import tempfile
+from typing import List, Optional
+from app.models import ScrapeJob
+from app.repositories.scrape_job import ScrapeJobRepository
+from app.services.linkedin_scraper import LinkedInScraperService, linked_in_scraper_service
+
+# Job state lives in a local SQLite file shared by the worker processes on this host
+SCRAPE_JOBS_DB_PATH = os.getenv("SCRAPE_JOBS_DB_PATH", os.path.join(tempfile.gettempdir(), "hermes-scrape-jobs.db"))
+SCRAPE_JOB_WORKERS = int(os.getenv("SCRAPE_JOB_WORKERS", "2"))
+# How often idle workers look for jobs submitted through other processes
+SCRAPE_JOB_POLL_SECONDS = float(os.getenv("SCRAPE_JOB_POLL_SECONDS", "5"))
+# Running jobs heartbeat; a job silent for the stale period is assumed orphaned and re-queued
+SCRAPE_JOB_HEARTBEAT_SECONDS = float(os.getenv("SCRAPE_JOB_HEARTBEAT_SECONDS", "15"))
+SCRAPE_JOB_STALE_SECONDS = float(os.getenv("SCRAPE_JOB_STALE_SECONDS", "60"))
+# A job interrupted this many times is marked failed instead of re-queued
+SCRAPE_JOB_MAX_ATTEMPTS = int(os.getenv("SCRAPE_JOB_MAX_ATTEMPTS", "3"))
+
+class ScrapeJobService:
+    """
+    Runs LinkedIn scrapes outside the request: submit() records a queued job and returns at once,
+    and a pool of worker tasks claims jobs from the store and runs them, recording per-profile
+    progress as it goes.
+    """
+
+    def __init__(self, job_repo: ScrapeJobRepository, scraper: LinkedInScraperService, workers: int = SCRAPE_JOB_WORKERS):
+        self.job_repo = job_repo
+        self.scraper = scraper
+        self.workers = workers
+        self._wake = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def submit(self, user_id: str, profile_urls: List[str]) -> ScrapeJob:
+        job = await self.job_repo.create(user_id, profile_urls)
+        self._wake.set()
+        return job
+
+    async def get(self, job_id: str, user_id: str) -> Optional[ScrapeJob]:
+        return await self.job_repo.find_by_id(job_id, user_id)
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        # Interrupted jobs stop heartbeating and are picked up again once stale
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                requeued, failed = await self.job_repo.requeue_stale(SCRAPE_JOB_STALE_SECONDS, SCRAPE_JOB_MAX_ATTEMPTS)
+                if requeued:
+                    print(f"Re-queued {requeued} interrupted scrape job(s)")
+                if failed:
+                    print(f"Failed {failed} scrape job(s) interrupted {SCRAPE_JOB_MAX_ATTEMPTS} times")
+
+                claimed = await self.job_repo.claim_next()
+                if claimed is None:
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), timeout=SCRAPE_JOB_POLL_SECONDS)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wake.clear()
+                    continue
+
+                job, user_id = claimed
+                await self._run(job, user_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Scrape job worker error: {e}")
+                await asyncio.sleep(SCRAPE_JOB_POLL_SECONDS)
+
+    async def _run(self, job: ScrapeJob, user_id: str) -> None:
+        async def heartbeat() -> None:
+            while True:
+                await asyncio.sleep(SCRAPE_JOB_HEARTBEAT_SECONDS)
+                try:
+                    await self.job_repo.touch(job.jobId)
+                except Exception as e:
+                    # Keep beating: a job that goes silent is handed to another worker while this one still runs
+                    print(f"Scrape job {job.jobId} heartbeat failed: {e}")
+
+        async def on_progress(profile_url: str, posts_scraped: int) -> None:
+            await self.job_repo.record_progress(job.jobId, posts_scraped)
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+        try:
+            result = await self.scraper.scrape_profiles(job.profileUrls, user_id, on_progress=on_progress)
+            error = None if result.success else result.error or "Scrape failed"
+            await self.job_repo.finish(job.jobId, result=result, error=error)
+        except Exception as e:
+            print(f"Scrape job {job.jobId} failed: {e}")
+            await self.job_repo.finish(job.jobId, error=str(e))
+        finally:
+            heartbeat_task.cancel()
+
+# Singleton instance
+scrape_job_service = ScrapeJobService(ScrapeJobRepository(SCRAPE_JOBS_DB_PATH), linked_in_scraper_service)
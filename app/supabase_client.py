@@ -1,9 +1,43 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+import httpx
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
 load_dotenv()
 
+# supabase-py's query builders are synchronous, so every `.execute()` is dispatched to a
+# bounded thread pool instead of running on the event loop. The pool size caps how many
+# PostgREST calls a worker has in flight; the HTTP pool is sized to match.
+SUPABASE_MAX_CONCURRENCY = int(os.getenv("SUPABASE_MAX_CONCURRENCY", "16"))
+SUPABASE_MAX_KEEPALIVE = int(os.getenv("SUPABASE_MAX_KEEPALIVE", str(SUPABASE_MAX_CONCURRENCY)))
+SUPABASE_QUERY_TIMEOUT = float(os.getenv("SUPABASE_QUERY_TIMEOUT", "30"))
+
+def _configure_connection_pool(supabase_client: Client) -> None:
+    # Replace the default PostgREST session with one whose pool matches the executor size
+    try:
+        postgrest = supabase_client.postgrest
+        session = postgrest.session
+        postgrest.session = httpx.Client(
+            base_url=session.base_url,
+            headers=session.headers,
+            timeout=httpx.Timeout(SUPABASE_QUERY_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=SUPABASE_MAX_CONCURRENCY,
+                max_keepalive_connections=SUPABASE_MAX_KEEPALIVE,
+            ),
+            # Keep the rest of the session settings postgrest-py configures
+            verify=postgrest.verify,
+            proxy=postgrest.proxy,
+            follow_redirects=session.follow_redirects,
+            http2=True,
+        )
+        session.close()
+    except AttributeError as e:
+        print(f"Warning: could not configure Supabase connection pool, using defaults: {e}")
+
 def get_supabase_client() -> Client:
     url: str = os.getenv("NEXT_PUBLIC_SUPABASE_URL")
     key: str = os.getenv("SUPABASE_SECRET_KEY")
@@ -16,7 +50,18 @@ def get_supabase_client() -> Client:
     # Supabase client with service role key bypasses RLS
     # auth options like autoRefreshToken and persistSession are not applicable for service key
     supabase_client: Client = create_client(url, key)
+    _configure_connection_pool(supabase_client)
     return supabase_client
 
+_query_executor = ThreadPoolExecutor(max_workers=SUPABASE_MAX_CONCURRENCY, thread_name_prefix="supabase")
+
+async def run_query(query: Any) -> Any:
+    """
+    Executes a PostgREST query builder on the bounded query pool and awaits the response,
+    so a slow query only occupies a pool thread rather than the whole event loop.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_query_executor, query.execute)
+
 # Singleton instance
 supabase_service_client = get_supabase_client()
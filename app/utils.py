@@ -1,6 +1,10 @@
 from datetime import datetime, timedelta
+import base64
+import json
 import re
-from typing import Optional
+from typing import Any, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
 
 def format_post_title(text: str) -> str:
     """
@@ -76,4 +80,40 @@ def extract_name_from_url(url: str) -> str:
         # Capitalize first letter of each part and join
         return " ".join([part.capitalize() for part in name_parts if part])
     
-    return "Unknown Author"
\ No newline at end of file
+    return "Unknown Author"
+
+def chunked(items: List[T], size: int) -> Iterator[List[T]]:
+    """
+    Splits a list into consecutive chunks of at most `size` items.
+    Used to keep bulk PostgREST requests (in_ filters, multi-row upserts) under URL and payload limits.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def encode_cursor(created_at: datetime, content_id: int) -> str:
+    """
+    Encodes a feed position (the sort key of the last row served) as an opaque URL-safe cursor.
+    """
+    payload = json.dumps([created_at.isoformat(), content_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decodes a cursor produced by encode_cursor back into (created_at ISO string, content_id).
+    Raises ValueError for malformed cursors.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, content_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        datetime.fromisoformat(created_at) # Validate before it is interpolated into a filter
+        return created_at, int(content_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Formats one Server-Sent Events message with a JSON-encoded payload.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,11 @@
+-- Migration: Unique profile and post URLs for bulk ingest
+-- The scraper now writes creators and posts with multi-row upserts (ON CONFLICT),
+-- which requires a unique index on the conflict target.
+
+-- Check for existing duplicates first, both queries must return no rows:
+-- SELECT profile_url, COUNT(*) FROM creator_profiles GROUP BY profile_url HAVING COUNT(*) > 1;
+-- SELECT post_url, COUNT(*) FROM creator_content GROUP BY post_url HAVING COUNT(*) > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_creator_profiles_profile_url ON creator_profiles(profile_url);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_creator_content_post_url ON creator_content(post_url);
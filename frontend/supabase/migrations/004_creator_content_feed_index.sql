@@ -0,0 +1,6 @@
+-- Migration: Index for keyset pagination of the content feed
+-- /api/content/feed seeks on (created_at, content_id) descending instead of using OFFSET,
+-- so each page is an index range scan regardless of depth.
+
+CREATE INDEX IF NOT EXISTS idx_creator_content_created_at_content_id
+ON creator_content(created_at DESC, content_id DESC);
@@ -0,0 +1,20 @@
+-- Migration: Materialized parsed-post projection on creator_content
+-- post_raw holds the Apify post as a JSON string. The feed used to json-parse it on every request;
+-- these columns hold the parsed view, written once at ingest.
+
+ALTER TABLE creator_content
+ADD COLUMN post_text TEXT,
+ADD COLUMN post_title TEXT,
+ADD COLUMN posted_at_date TEXT,
+ADD COLUMN posted_at_timestamp BIGINT,
+ADD COLUMN posted_at_relative TEXT,
+ADD COLUMN post_type TEXT,
+ADD COLUMN post_stats JSONB,
+ADD COLUMN post_media JSONB,
+ADD COLUMN post_article JSONB;
+
+COMMENT ON COLUMN creator_content.post_title IS 'Derived from post_raw at ingest; NULL means the row has not been projected yet';
+COMMENT ON COLUMN creator_content.posted_at_timestamp IS 'LinkedIn post time, unix milliseconds';
+
+-- Speeds up the backfill scan for rows that still need projecting
+CREATE INDEX IF NOT EXISTS idx_creator_content_unprojected ON creator_content(content_id) WHERE post_title IS NULL;
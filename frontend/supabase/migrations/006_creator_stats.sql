@@ -0,0 +1,75 @@
+-- Migration: Incrementally maintained per-creator engagement aggregates
+-- Replaces the full creator_content scan (and json parse of every post) on each creators request.
+-- A row trigger on creator_content applies +/- deltas, so inserts, re-scrapes that update
+-- post_stats, creator reassignment and deletes all keep the totals exact.
+-- Requires 005_creator_content_projection.sql (reads the post_stats column).
+
+CREATE TABLE IF NOT EXISTS creator_stats (
+  creator_id BIGINT PRIMARY KEY REFERENCES creator_profiles(creator_id) ON DELETE CASCADE,
+  post_count BIGINT NOT NULL DEFAULT 0,
+  total_reactions BIGINT NOT NULL DEFAULT 0,
+  total_comments BIGINT NOT NULL DEFAULT 0,
+  total_reposts BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION apply_creator_stats_delta(
+  p_creator_id BIGINT,
+  p_posts BIGINT,
+  p_reactions BIGINT,
+  p_comments BIGINT,
+  p_reposts BIGINT
+) RETURNS void AS $$
+  INSERT INTO creator_stats AS s (creator_id, post_count, total_reactions, total_comments, total_reposts, updated_at)
+  VALUES (p_creator_id, p_posts, p_reactions, p_comments, p_reposts, now())
+  ON CONFLICT (creator_id) DO UPDATE SET
+    post_count = s.post_count + EXCLUDED.post_count,
+    total_reactions = s.total_reactions + EXCLUDED.total_reactions,
+    total_comments = s.total_comments + EXCLUDED.total_comments,
+    total_reposts = s.total_reposts + EXCLUDED.total_reposts,
+    updated_at = now();
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION creator_content_maintain_stats() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_creator_stats_delta(
+      OLD.creator_id,
+      -1,
+      -COALESCE((OLD.post_stats->>'total_reactions')::BIGINT, 0),
+      -COALESCE((OLD.post_stats->>'comments')::BIGINT, 0),
+      -COALESCE((OLD.post_stats->>'reposts')::BIGINT, 0)
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_creator_stats_delta(
+      NEW.creator_id,
+      1,
+      COALESCE((NEW.post_stats->>'total_reactions')::BIGINT, 0),
+      COALESCE((NEW.post_stats->>'comments')::BIGINT, 0),
+      COALESCE((NEW.post_stats->>'reposts')::BIGINT, 0)
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS creator_content_stats ON creator_content;
+CREATE TRIGGER creator_content_stats
+AFTER INSERT OR DELETE OR UPDATE OF creator_id, post_stats ON creator_content
+FOR EACH ROW EXECUTE FUNCTION creator_content_maintain_stats();
+
+-- Seed from existing rows. Rows not yet projected count as posts with zero engagement;
+-- the projection backfill updates post_stats and the trigger adds their engagement.
+INSERT INTO creator_stats (creator_id, post_count, total_reactions, total_comments, total_reposts)
+SELECT
+  creator_id,
+  COUNT(*),
+  COALESCE(SUM((post_stats->>'total_reactions')::BIGINT), 0),
+  COALESCE(SUM((post_stats->>'comments')::BIGINT), 0),
+  COALESCE(SUM((post_stats->>'reposts')::BIGINT), 0)
+FROM creator_content
+GROUP BY creator_id
+ON CONFLICT (creator_id) DO NOTHING;
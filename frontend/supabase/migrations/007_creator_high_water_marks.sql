@@ -0,0 +1,38 @@
+-- Migration: Per-creator high-water marks for incremental scraping
+-- The newest post already ingested for each creator. Scrapes skip every post at or below the
+-- mark without querying creator_content, so re-scraping costs in proportion to new posts.
+-- Requires 005_creator_content_projection.sql (seeds from posted_at_timestamp).
+
+ALTER TABLE creator_profiles
+ADD COLUMN last_post_urn TEXT,
+ADD COLUMN last_posted_at_timestamp BIGINT;
+
+COMMENT ON COLUMN creator_profiles.last_posted_at_timestamp IS 'LinkedIn post time of the newest ingested post, unix milliseconds';
+
+-- Marks only move forward, so an older scrape finishing late cannot roll one back.
+-- marks: [{"creator_id": 1, "last_post_urn": "...", "last_posted_at_timestamp": 1700000000000}, ...]
+CREATE OR REPLACE FUNCTION advance_creator_high_water_marks(marks JSONB) RETURNS void AS $$
+  UPDATE creator_profiles AS p
+  SET
+    last_post_urn = m.last_post_urn,
+    last_posted_at_timestamp = m.last_posted_at_timestamp
+  FROM jsonb_to_recordset(marks) AS m(creator_id BIGINT, last_post_urn TEXT, last_posted_at_timestamp BIGINT)
+  WHERE p.creator_id = m.creator_id
+    AND (p.last_posted_at_timestamp IS NULL OR p.last_posted_at_timestamp < m.last_posted_at_timestamp);
+$$ LANGUAGE sql;
+
+-- Seed from posts already ingested (post_raw is JSON for every scraped post)
+UPDATE creator_profiles AS p
+SET
+  last_post_urn = latest.urn,
+  last_posted_at_timestamp = latest.posted_at_timestamp
+FROM (
+  SELECT DISTINCT ON (creator_id)
+    creator_id,
+    posted_at_timestamp,
+    CASE WHEN post_raw LIKE '{%' THEN post_raw::jsonb->>'urn' END AS urn
+  FROM creator_content
+  WHERE posted_at_timestamp IS NOT NULL
+  ORDER BY creator_id, posted_at_timestamp DESC
+) AS latest
+WHERE p.creator_id = latest.creator_id;
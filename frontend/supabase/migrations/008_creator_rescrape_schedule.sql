@@ -0,0 +1,31 @@
+-- Migration: Scheduled re-scrapes of followed creators
+-- Records when each creator was last scraped, and exposes the followed creators with the inputs
+-- of the re-scrape priority (staleness, last post time, engagement) in one round trip.
+-- Requires 006_creator_stats.sql and 007_creator_high_water_marks.sql.
+
+ALTER TABLE creator_profiles
+ADD COLUMN last_scraped_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN creator_profiles.last_scraped_at IS 'End of the last scheduled re-scrape; NULL until the first one';
+
+-- Creators at least one user follows. Never-scraped creators report their creation time.
+CREATE OR REPLACE FUNCTION find_rescrape_candidates() RETURNS TABLE (
+  creator_id BIGINT,
+  profile_url TEXT,
+  last_scraped_at TIMESTAMPTZ,
+  last_posted_at_timestamp BIGINT,
+  post_count BIGINT,
+  total_engagement BIGINT
+) AS $$
+  SELECT
+    p.creator_id,
+    p.profile_url,
+    COALESCE(p.last_scraped_at, p.created_at),
+    p.last_posted_at_timestamp,
+    COALESCE(s.post_count, 0),
+    COALESCE(s.total_reactions + s.total_comments + s.total_reposts, 0)
+  FROM creator_profiles AS p
+  LEFT JOIN creator_stats AS s ON s.creator_id = p.creator_id
+  WHERE p.platform = 'linkedin'
+    AND EXISTS (SELECT 1 FROM user_follows AS f WHERE f.creator_id = p.creator_id);
+$$ LANGUAGE sql STABLE;
@@ -0,0 +1,21 @@
+-- Migration: Near-duplicate clusters of creator_content
+-- Reposts and lightly edited copies arrive under different post_urls. Ingest now groups posts
+-- with similar text (MinHash over word shingles) into clusters: the first post of a cluster is
+-- its original, later ones are flagged, and the feed can leave them out.
+-- Requires 004_creator_content_feed_index.sql (the collapsed feed mirrors its index).
+
+ALTER TABLE creator_content
+ADD COLUMN near_duplicate_cluster BIGINT,
+ADD COLUMN is_near_duplicate BOOLEAN NOT NULL DEFAULT false;
+
+COMMENT ON COLUMN creator_content.near_duplicate_cluster IS 'Hash of the post_url of the cluster''s first post; NULL for texts too short to compare';
+COMMENT ON COLUMN creator_content.is_near_duplicate IS 'A near-duplicate of an earlier post in the same cluster';
+
+CREATE INDEX IF NOT EXISTS idx_creator_content_near_duplicate_cluster
+ON creator_content(near_duplicate_cluster)
+WHERE near_duplicate_cluster IS NOT NULL;
+
+-- Keyset pagination of the feed with duplicates collapsed
+CREATE INDEX IF NOT EXISTS idx_creator_content_originals_created_at_content_id
+ON creator_content(created_at DESC, content_id DESC)
+WHERE NOT is_near_duplicate;
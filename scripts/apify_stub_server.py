@@ -0,0 +1,95 @@
+"""
+Local stand-in for the parts of the Apify API the LinkedIn scraper uses, for exercising both
+ingest modes without an Apify account. Each actor run "scrapes" a fixed number of synthetic
+posts for the requested username, appending them to its dataset over a few seconds.
+
+Usage (from the repository root):
+  python -m scripts.apify_stub_server [--port 8765] [--posts 250] [--run-seconds 5]
+
+then start the API with
+  APIFY_BASE_URL=http://127.0.0.1:8765 APIFY_API_TOKEN=stub APIFY_INGEST_MODE=pipelined
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from typing import Any, Dict, List
+import uvicorn
+from fastapi import Body, FastAPI, HTTPException
+
+app = FastAPI()
+runs: Dict[str, Dict[str, Any]] = {}
+settings = {"posts": 250, "run_seconds": 5.0}
+
+def _make_post(username: str, index: int) -> Dict[str, Any]:
+    timestamp = 1_700_000_000_000 + index * 3_600_000
+    return {
+        "urn": f"{username}-{index}",
+        "url": f"https://www.linkedin.com/posts/{username}_{index}",
+        "text": f"Synthetic post {index} by {username}",
+        "post_type": "regular",
+        "posted_at": {"date": time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(timestamp / 1000)), "relative": "1d", "timestamp": timestamp},
+        "author": {"first_name": username.title(), "last_name": "Stub", "username": username},
+        "stats": {"total_reactions": index % 50, "like": index % 50, "comments": index % 7, "reposts": index % 3},
+    }
+
+def _run_view(run: Dict[str, Any]) -> Dict[str, Any]:
+    return {"id": run["id"], "status": run["status"], "defaultDatasetId": run["id"]}
+
+async def _scrape(run: Dict[str, Any], username: str) -> None:
+    # Newest posts first, spread evenly over the run time
+    delay = settings["run_seconds"] / max(settings["posts"], 1)
+    for index in reversed(range(settings["posts"])):
+        if run["status"] == "ABORTED":
+            return
+        run["items"].append(_make_post(username, index))
+        await asyncio.sleep(delay)
+    run["status"] = "SUCCEEDED"
+
+@app.post("/v2/acts/{actor_id}/runs")
+async def start_run(actor_id: str, token: str, body: Dict[str, Any] = Body(...)):
+    run_id = uuid.uuid4().hex
+    runs[run_id] = {"id": run_id, "status": "RUNNING", "items": []}
+    asyncio.create_task(_scrape(runs[run_id], body.get("username", "someone")))
+    return {"data": _run_view(runs[run_id])}
+
+@app.get("/v2/actor-runs/{run_id}")
+async def get_run(run_id: str, token: str, waitForFinish: int = 0):
+    run = runs.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    deadline = time.monotonic() + waitForFinish
+    while run["status"] == "RUNNING" and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    return {"data": _run_view(run)}
+
+@app.post("/v2/actor-runs/{run_id}/abort")
+async def abort_run(run_id: str, token: str):
+    run = runs.get(run_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Run not found")
+    if run["status"] == "RUNNING":
+        run["status"] = "ABORTED"
+    return {"data": _run_view(run)}
+
+@app.get("/v2/datasets/{dataset_id}/items")
+async def dataset_items(dataset_id: str, token: str, offset: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+    run = runs.get(dataset_id)
+    if not run:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    return run["items"][offset:offset + limit]
+
+@app.post("/v2/acts/{actor_id}/run-sync-get-dataset-items")
+async def run_sync(actor_id: str, token: str, body: Dict[str, Any] = Body(...)) -> List[Dict[str, Any]]:
+    run = {"id": uuid.uuid4().hex, "status": "RUNNING", "items": []}
+    await _scrape(run, body.get("username", "someone"))
+    return run["items"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Apify API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--posts", type=int, default=250)
+    parser.add_argument("--run-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+    settings.update(posts=args.posts, run_seconds=args.run_seconds)
+    uvicorn.run(app, host="127.0.0.1", port=args.port)
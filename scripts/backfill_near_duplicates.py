@@ -0,0 +1,49 @@
+"""
+Clusters near-duplicate posts among creator_content rows ingested before clustering existed
+(see frontend/supabase/migrations/009_creator_content_near_duplicates.sql). Rows are processed
+oldest first, so the earliest post of each cluster stays the original.
+
+Usage (from the repository root):
+  python -m scripts.backfill_near_duplicates [--batch-size 500]
+"""
+import argparse
+import asyncio
+from app.near_duplicates import NearDuplicateIndex
+from app.services.content import content_repository
+
+async def backfill(batch_size: int) -> None:
+    index = NearDuplicateIndex(content_repository.iter_recent_texts)
+    last_content_id = 0
+    total = 0
+    duplicates = 0
+
+    while True:
+        rows = await content_repository.find_unclustered(last_content_id, batch_size)
+        if not rows:
+            break
+
+        duplicates += index.annotate(rows)
+        updates = [
+            {
+                "content_id": row["content_id"],
+                "creator_id": row["creator_id"],
+                "post_url": row["post_url"],
+                "post_raw": row["post_raw"],
+                "near_duplicate_cluster": row["near_duplicate_cluster"],
+                "is_near_duplicate": row["is_near_duplicate"],
+            }
+            for row in rows
+        ]
+        await content_repository.update_near_duplicates(updates)
+
+        last_content_id = rows[-1]["content_id"]
+        total += len(rows)
+        print(f"Clustered {total} rows, {duplicates} near-duplicates (last content_id: {last_content_id})")
+
+    print(f"Done, {total} rows clustered, {duplicates} near-duplicates")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill creator_content near-duplicate clusters")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
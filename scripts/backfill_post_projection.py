@@ -0,0 +1,43 @@
+"""
+Backfills the parsed-post projection columns on creator_content for rows ingested before
+they existed (see frontend/supabase/migrations/005_creator_content_projection.sql).
+
+Usage (from the repository root):
+  python -m scripts.backfill_post_projection [--batch-size 500]
+"""
+import argparse
+import asyncio
+from app.projection import project_post_raw, projection_columns
+from app.services.content import content_repository
+
+async def backfill(batch_size: int) -> None:
+    last_content_id = 0
+    total = 0
+
+    while True:
+        rows = await content_repository.find_unprojected(last_content_id, batch_size)
+        if not rows:
+            break
+
+        updates = [
+            {
+                "content_id": row["content_id"],
+                "creator_id": row["creator_id"],
+                "post_url": row["post_url"],
+                **projection_columns(project_post_raw(row["post_raw"])),
+            }
+            for row in rows
+        ]
+        await content_repository.update_projections(updates)
+
+        last_content_id = rows[-1]["content_id"]
+        total += len(rows)
+        print(f"Backfilled {total} rows (last content_id: {last_content_id})")
+
+    print(f"Done, {total} rows backfilled")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill creator_content projection columns")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(backfill(args.batch_size))
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark for the generate-edit word diff (app/diff.py) on posts at the 50,000-character
+request limit, from light edits to full rewrites. Each result is checked by replaying the
+changed spans onto the original text.
+
+Usage (from the repository root):
+  python -m scripts.bench_diff [--chars 50000] [--repeat 5] [--seed 7]
+"""
+import argparse
+import random
+import time
+from typing import List
+from app.diff import tokenize, word_diff
+
+# Zipf-ish vocabulary so common words repeat like in real prose
+VOCABULARY = [f"w{i}" for i in range(5000)]
+WEIGHTS = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+
+def make_text(rng: random.Random, chars: int) -> str:
+    words: List[str] = []
+    length = 0
+    while length < chars:
+        word = rng.choices(VOCABULARY, WEIGHTS)[0]
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars].rstrip()
+
+def mutate(rng: random.Random, text: str, rate: float) -> str:
+    words = text.split()
+    result = []
+    for word in words:
+        roll = rng.random()
+        if roll < rate / 3:
+            continue # delete
+        if roll < 2 * rate / 3:
+            result.append(rng.choices(VOCABULARY, WEIGHTS)[0]) # replace
+            continue
+        result.append(word)
+        if roll < rate:
+            result.append(rng.choices(VOCABULARY, WEIGHTS)[0]) # insert
+    return " ".join(result)
+
+def apply_changes(original: str, suggested: str, changes) -> List[str]:
+    # Rebuild the suggested word sequence from the original plus the changed spans
+    pieces = []
+    position = 0
+    for change in changes:
+        pieces.append(original[position:change.originalStart])
+        pieces.append(" " + suggested[change.suggestedStart:change.suggestedEnd] + " ")
+        position = change.originalEnd
+    pieces.append(original[position:])
+    return "".join(pieces).split()
+
+def main(chars: int, repeat: int, seed: int) -> None:
+    rng = random.Random(seed)
+    original = make_text(rng, chars)
+    cases = [
+        ("identical", original),
+        ("1% edited", mutate(rng, original, 0.01)),
+        ("10% edited", mutate(rng, original, 0.10)),
+        ("50% edited", mutate(rng, original, 0.50)),
+        ("rewritten", make_text(rng, chars)),
+    ]
+
+    print(f"original: {len(original)} chars, {len(tokenize(original))} words")
+    for name, suggested in cases:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            additions, deletions, changes = word_diff(original, suggested)
+            timings.append(time.perf_counter() - started)
+
+        assert apply_changes(original, suggested, changes) == suggested.split(), f"{name}: spans do not replay"
+        print(
+            f"{name:>12}: best {min(timings) * 1000:8.1f} ms, median {sorted(timings)[len(timings) // 2] * 1000:8.1f} ms"
+            f" | +{additions} -{deletions} words in {len(changes)} spans"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the generate-edit word diff")
+    parser.add_argument("--chars", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    main(args.chars, args.repeat, args.seed)
@@ -0,0 +1,110 @@
+"""
+Checks that the sync and pipelined ingest modes store the same rows. Both modes scrape the
+same profiles from the Apify stub (scripts/apify_stub_server.py, started in-process) into
+in-memory repositories, twice each: a first scrape that stores everything and a second one
+that should store nothing new. Stored post URLs and the creators' final high-water marks
+must match between the modes.
+
+Usage (from the repository root, with the API's environment variables set):
+  python -m scripts.check_ingest_modes [--profiles 3] [--posts 250] [--run-seconds 2]
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, List, Set, Tuple
+import uvicorn
+from app.models import CreatorProfile
+from app.services.apify_client import ApifyClient
+from app.services.linkedin_scraper import LinkedInScraperService
+from scripts import apify_stub_server
+
+STUB_PORT = 8766
+
+class MemoryCreatorRepository:
+    def __init__(self):
+        self.creators: Dict[str, CreatorProfile] = {}
+
+    async def find_by_profile_urls(self, profile_urls: List[str]) -> List[CreatorProfile]:
+        return [self.creators[url].model_copy() for url in profile_urls if url in self.creators]
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> List[CreatorProfile]:
+        created = []
+        for row in rows:
+            if row["profile_url"] not in self.creators:
+                self.creators[row["profile_url"]] = CreatorProfile(creator_id=len(self.creators) + 1, **row)
+                created.append(self.creators[row["profile_url"]].model_copy())
+        return created
+
+    async def advance_high_water_marks(self, marks: List[Dict[str, Any]]) -> None:
+        by_id = {creator.creator_id: creator for creator in self.creators.values()}
+        for mark in marks:
+            creator = by_id[mark["creator_id"]]
+            if creator.last_posted_at_timestamp is None or mark["last_posted_at_timestamp"] > creator.last_posted_at_timestamp:
+                creator.last_post_urn = mark["last_post_urn"]
+                creator.last_posted_at_timestamp = mark["last_posted_at_timestamp"]
+
+class MemoryContentRepository:
+    def __init__(self):
+        self.rows: Dict[str, Dict[str, Any]] = {}
+
+    async def find_existing_post_urls(self, post_urls: List[str]) -> Set[str]:
+        return {url for url in post_urls if url in self.rows}
+
+    async def find_stats_by_post_urls(self, post_urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        return {url: {"content_id": url, **self.rows[url]} for url in post_urls if url in self.rows}
+
+    async def create_many(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.rows.setdefault(row["post_url"], row)
+
+    async def update_stats(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.rows[row["post_url"]].update(post_stats=row["post_stats"])
+
+class MemoryUserFollowRepository:
+    async def upsert_many(self, user_id: str, creator_ids: List[int]) -> List[Any]:
+        return []
+
+async def scrape_twice(mode: str, profile_urls: List[str]) -> Tuple[Set[str], Dict[str, Any], List[int]]:
+    creators, content = MemoryCreatorRepository(), MemoryContentRepository()
+    scraper = LinkedInScraperService("stub", creators, content, MemoryUserFollowRepository(), ingest_mode=mode)
+    scraper.apify = ApifyClient(f"http://127.0.0.1:{STUB_PORT}", "stub")
+
+    new_posts = []
+    for _ in range(2):
+        result = await scraper.scrape_profiles(profile_urls, "check-user")
+        new_posts.append(result.newPosts or 0)
+    await scraper.apify.http_client.aclose()
+
+    marks = {url: (creator.last_post_urn, creator.last_posted_at_timestamp) for url, creator in creators.creators.items()}
+    return set(content.rows), marks, new_posts
+
+async def main(profiles: int, posts: int, run_seconds: float) -> None:
+    apify_stub_server.settings.update(posts=posts, run_seconds=run_seconds)
+    server = uvicorn.Server(uvicorn.Config(apify_stub_server.app, host="127.0.0.1", port=STUB_PORT, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        profile_urls = [f"https://www.linkedin.com/in/creator{i}" for i in range(profiles)]
+        sync_rows, sync_marks, sync_new = await scrape_twice("sync", profile_urls)
+        pipelined_rows, pipelined_marks, pipelined_new = await scrape_twice("pipelined", profile_urls)
+    finally:
+        server.should_exit = True
+        await serving
+
+    print(f"sync:      {len(sync_rows)} rows stored, new posts per scrape {sync_new}")
+    print(f"pipelined: {len(pipelined_rows)} rows stored, new posts per scrape {pipelined_new}")
+    assert len(sync_rows) == profiles * posts, "sync did not store every post"
+    assert pipelined_rows == sync_rows, f"stored rows differ: {len(sync_rows ^ pipelined_rows)} post URLs in only one mode"
+    assert pipelined_marks == sync_marks, "high-water marks differ"
+    assert sync_new[1] == pipelined_new[1] == 0, "second scrape stored posts again"
+    print("OK: both modes stored the same rows and marks")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that both ingest modes store the same rows")
+    parser.add_argument("--profiles", type=int, default=3)
+    parser.add_argument("--posts", type=int, default=250)
+    parser.add_argument("--run-seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.profiles, args.posts, args.run_seconds))